@@ -1,43 +1,121 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+from cachetools import TLRUCache, TTLCache
+import jwt
+from jwt import PyJWTError as JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.models import User
 
-# 비밀번호 해싱 컨텍스트
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2 스키마
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# bcrypt 연산 전용 스레드 풀 (이벤트 루프 블로킹 방지)
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="password-hash")
+
+# 디코딩된 JWT 페이로드 캐시 (토큰 만료 시각과 60초 중 이른 시점까지 유지)
+_TOKEN_CACHE_TTL = 60
+_TOKEN_CACHE = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda _token, payload, now: min(now + _TOKEN_CACHE_TTL, payload.get("exp", now)),
+    timer=time.time,
+)
+
+# 사용자 상태 스냅샷 캐시 (user_id -> (role, is_active, is_approved))
+# - 프로세스 로컬 캐시이므로 다른 워커에서의 상태 변경은 USER_CACHE_TTL 이내에 반영됨
+_USER_CACHE = TTLCache(maxsize=10_000, ttl=settings.USER_CACHE_TTL)
+_USER_CACHE_LOCK = threading.Lock()
+
+
+# 사용자 상태가 바뀌었을 때 캐시 무효화
+def invalidate_user_cache(user_id):
+    with _USER_CACHE_LOCK:
+        _USER_CACHE.pop(str(user_id), None)
+
+
+# 인증 경로에서 사용하는 컬럼만 로드하는 옵션과 조회 쿼리 (한 번만 생성해 재사용)
+_USER_STATUS_OPTIONS = [load_only(User.id, User.role, User.is_active, User.is_approved)]
+# 로그인 조회: 비밀번호 검증과 로그인 응답에 필요한 컬럼만 로드
+_USER_BY_EMAIL = (
+    select(User)
+    .where(User.email == bindparam("email"))
+    .options(
+        load_only(
+            User.id,
+            User.email,
+            User.name,
+            User.contact_email,
+            User.hashed_password,
+            User.role,
+            User.is_active,
+            User.is_approved,
+            User.created_at,
+        )
+    )
+)
+
+
+# bcrypt 비용은 설정값 사용, 식별자는 고정 (기존 해시는 자체에 저장된 비용으로 검증됨)
+_BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
+_BCRYPT_PREFIX = b"2b"
+
+
+# bcrypt는 72바이트까지만 사용하므로 passlib과 동일하게 잘라서 처리
+def _encode_password(password: str) -> bytes:
+    return password.encode("utf-8")[:72]
+
 
 # 비밀번호 검증 함수
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    if not hashed_password:
+        return False
+    try:
+        return bcrypt.checkpw(_encode_password(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:
+        # 알 수 없는 형식의 해시
+        return False
 
 
 # 비밀번호 해싱 함수
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=_BCRYPT_ROUNDS, prefix=_BCRYPT_PREFIX)
+    return bcrypt.hashpw(_encode_password(password), salt).decode("utf-8")
 
 
-# 사용자 인증 함수
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        return False
-    if not verify_password(password, user.hashed_password):
-        return False
-    # 관리자는 항상 로그인 가능, 일반 사용자는 승인된 경우만 로그인 가능
-    if user.role != "admin" and not user.is_approved:
-        return False
-    return user
+# 존재하지 않는 사용자 로그인 시에도 같은 비용의 검증을 수행하기 위한 더미 해시
+# (모듈 로드 시 한 번 계산하며, 첫 로그인 요청이 bcrypt 초기화 비용을 떠안지 않도록 하는 역할도 겸함)
+DUMMY_PASSWORD_HASH = get_password_hash("dummy-password-for-timing")
+
+
+# 비밀번호 검증 (스레드 풀에서 실행)
+async def verify_password_async(plain_password, hashed_password):
+    return await asyncio.get_running_loop().run_in_executor(
+        _HASH_POOL, verify_password, plain_password, hashed_password
+    )
+
+
+# 비밀번호 해싱 (스레드 풀에서 실행)
+async def get_password_hash_async(password):
+    return await asyncio.get_running_loop().run_in_executor(_HASH_POOL, get_password_hash, password)
+
+
+# 이메일로 사용자 조회 (로그인용)
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(_USER_BY_EMAIL, {"email": email})
+    return result.scalar_one_or_none()
 
 
 # 액세스 토큰 생성 함수
@@ -53,22 +131,39 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 # 현재 사용자 가져오기
-async def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+    payload = _TOKEN_CACHE.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
             raise credentials_exception
-    except JWTError:
+        _TOKEN_CACHE[token] = payload
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise credentials_exception
+
+    with _USER_CACHE_LOCK:
+        snapshot = _USER_CACHE.get(user_id)
+    if snapshot is not None:
+        role, is_active, is_approved = snapshot
+        # 라우터에서는 id/role/is_active만 사용하므로 세션에 붙지 않은 객체로 반환
+        return User(id=uuid.UUID(user_id), role=role, is_active=is_active, is_approved=is_approved)
+
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
         raise credentials_exception
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_uuid, options=_USER_STATUS_OPTIONS)
     if user is None:
         raise credentials_exception
+    with _USER_CACHE_LOCK:
+        _USER_CACHE[user_id] = (user.role, user.is_active, user.is_approved)
     return user
 
 
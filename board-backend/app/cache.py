@@ -0,0 +1,78 @@
+import logging
+from typing import Any, Optional
+
+import orjson
+import redis
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 응답 캐시용 Redis 클라이언트 (Redis 장애 시에는 캐시 없이 DB 조회로 동작)
+_client = redis.Redis.from_url(settings.CACHE_REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+# 비동기 엔드포인트용 클라이언트 (이벤트 루프를 막지 않음)
+_async_client = aioredis.Redis.from_url(settings.CACHE_REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+_KEY_PREFIX = "docurag"
+
+
+def _make_key(namespace: str, key: str) -> str:
+    return f"{_KEY_PREFIX}:{namespace}:{key}"
+
+
+def cache_get(namespace: str, key: str = "") -> Optional[Any]:
+    """캐시된 값을 조회합니다. 없거나 Redis 오류 시 None을 반환합니다."""
+    try:
+        value = _client.get(_make_key(namespace, key))
+    except redis.RedisError as e:
+        logger.warning(f"캐시 조회 실패 ({namespace}): {str(e)}")
+        return None
+    return orjson.loads(value) if value is not None else None
+
+
+def cache_set(namespace: str, key: str, value: Any, ttl: int) -> None:
+    """값을 JSON으로 직렬화해 TTL과 함께 저장합니다."""
+    try:
+        _client.set(_make_key(namespace, key), orjson.dumps(value), ex=ttl)
+    except redis.RedisError as e:
+        logger.warning(f"캐시 저장 실패 ({namespace}): {str(e)}")
+
+
+def cache_clear(namespace: str) -> None:
+    """네임스페이스에 속한 캐시를 모두 삭제합니다."""
+    try:
+        keys = list(_client.scan_iter(match=_make_key(namespace, "*"), count=500))
+        if keys:
+            _client.unlink(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"캐시 삭제 실패 ({namespace}): {str(e)}")
+
+
+async def acache_get(namespace: str, key: str = "") -> Optional[Any]:
+    """cache_get의 비동기 버전"""
+    try:
+        value = await _async_client.get(_make_key(namespace, key))
+    except redis.RedisError as e:
+        logger.warning(f"캐시 조회 실패 ({namespace}): {str(e)}")
+        return None
+    return orjson.loads(value) if value is not None else None
+
+
+async def acache_set(namespace: str, key: str, value: Any, ttl: int) -> None:
+    """cache_set의 비동기 버전"""
+    try:
+        await _async_client.set(_make_key(namespace, key), orjson.dumps(value), ex=ttl)
+    except redis.RedisError as e:
+        logger.warning(f"캐시 저장 실패 ({namespace}): {str(e)}")
+
+
+async def acache_clear(namespace: str) -> None:
+    """cache_clear의 비동기 버전"""
+    try:
+        keys = [key async for key in _async_client.scan_iter(match=_make_key(namespace, "*"), count=500)]
+        if keys:
+            await _async_client.unlink(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"캐시 삭제 실패 ({namespace}): {str(e)}")
@@ -1,19 +1,19 @@
-import os
 from celery import Celery
 from celery.signals import worker_ready
 
 from app.config import settings
 
-# Redis 연결 URL 설정
-broker_url = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
-result_backend = os.environ.get("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
-
 # Celery 객체 생성
 celery = Celery(
     "board_backend",
-    broker=broker_url,
-    backend=result_backend,
-    include=["app.tasks.file_tasks", "app.tasks.vectorize_tasks"],
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.tasks.file_tasks",
+        "app.tasks.vectorize_tasks",
+        "app.tasks.storage_tasks",
+        "app.tasks.chunk_tasks",
+    ],
 )
 
 # 선택적 설정
@@ -26,7 +26,14 @@ celery.conf.update(
     task_track_started=True,  # 작업 시작 시점을 추적
     task_time_limit=3600,  # 작업 제한 시간 (초)
     worker_hijack_root_logger=False,  # 기존 로거 설정 유지
-    worker_prefetch_multiplier=1,  # 동시에 가져올 태스크 수 제한
+    worker_prefetch_multiplier=1,  # 파일 업로드/벡터화처럼 실행 시간 편차가 큰 태스크 위주라 1로 유지
+    broker_pool_limit=50,  # 브로커 연결 풀 크기
+    redis_socket_keepalive=True,  # Redis 연결 유지
+    redis_socket_timeout=30,
+    task_compression="gzip",  # 메시지/결과 압축
+    result_compression="gzip",
+    # 스토리지 감사 작업은 별도 큐로 분리해 업로드/벡터화 작업과 섞이지 않도록 함
+    task_routes={"verify_minio_object": {"queue": "storage_audit"}},
 )
 
 
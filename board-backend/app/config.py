@@ -1,4 +1,7 @@
-import os
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -8,45 +11,101 @@ load_dotenv()
 
 class Settings(BaseSettings):
     # 데이터베이스 설정
-    DB_HOST: str = os.getenv("DB_HOST", "localhost")
-    DB_PORT: int = int(os.getenv("DB_PORT", "5432"))
-    DB_USER: str = os.getenv("DB_USER", "postgres")
-    DB_PASSWORD: str = os.getenv("DB_PASSWORD", "password")
-    DB_NAME: str = os.getenv("DB_NAME", "board_rag")
+    DB_HOST: str = "localhost"
+    DB_PORT: int = 5432
+    DB_USER: str = "postgres"
+    DB_PASSWORD: str = "password"
+    DB_NAME: str = "board_rag"
+
+    # SQLALCHEMY 데이터베이스 URL (미설정 시 위 값으로 조합)
+    DATABASE_URL: Optional[str] = None
+
+    # 커넥션 풀 설정 (동기 엔진)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    # 커넥션 풀 설정 (비동기 엔진, 동기 엔진과 별도의 풀을 가짐)
+    ASYNC_DB_POOL_SIZE: int = 10
+    ASYNC_DB_MAX_OVERFLOW: int = 10
+    # 프로세스 하나가 사용할 수 있는 최대 연결 수 (두 엔진의 pool_size + max_overflow 합의 상한)
+    # - PostgreSQL max_connections(기본 100)를 이 서버에 접속하는 프로세스 수(API 워커 + Celery 워커)로 나눈 값 이하로 설정
+    DB_CONNECTION_BUDGET: int = 40
+    DB_POOL_RECYCLE: int = 1800
+    # asyncpg 연결별 prepared statement 캐시 크기
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
 
-    # SQLALCHEMY 데이터베이스 URL
-    DATABASE_URL: str = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    # 세션 시간대 (접속 시 startup 파라미터로 전달)
+    DB_TIMEZONE: str = "Asia/Seoul"
 
     # JWT 설정
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
-    ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+    SECRET_KEY: str = "your-secret-key-here"
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # 인증 시 사용자 상태(role/is_active/is_approved) 로컬 캐시 유지 시간(초)
+    # 캐시 무효화는 변경을 처리한 프로세스에만 적용되므로, 다른 워커/인스턴스에서는 최대 이 시간만큼
+    # 비활성화·승인 취소 이전 상태로 인증될 수 있음 (0이면 캐시 사용 안 함)
+    USER_CACHE_TTL: int = 5
+
+    # 비밀번호 해시 설정 (라운드가 1 늘 때마다 해싱/검증 시간이 약 2배로 증가)
+    BCRYPT_ROUNDS: int = 12
 
     # MinIO 설정
-    MINIO_ENDPOINT: str = os.getenv("MINIO_ENDPOINT", "localhost:9000")
-    MINIO_ACCESS_KEY: str = os.getenv("MINIO_ACCESS_KEY", "minioadmin")
-    MINIO_SECRET_KEY: str = os.getenv("MINIO_SECRET_KEY", "minioadmin")
-    MINIO_SECURE: bool = os.getenv("MINIO_SECURE", "False").lower() == "true"
-    MINIO_BUCKET_NAME: str = os.getenv("MINIO_BUCKET_NAME", "documents")
+    MINIO_ENDPOINT: str = "localhost:9000"
+    MINIO_ACCESS_KEY: str = "minioadmin"
+    MINIO_SECRET_KEY: str = "minioadmin"
+    MINIO_SECURE: bool = False
+    MINIO_BUCKET_NAME: str = "documents"
 
     # Milvus 설정
-    MILVUS_HOST: str = os.getenv("MILVUS_HOST", "localhost")
-    MILVUS_PORT: int = int(os.getenv("MILVUS_PORT", "19530"))
-    MILVUS_COLLECTION: str = os.getenv("MILVUS_COLLECTION", "document_chunks")
+    MILVUS_HOST: str = "localhost"
+    MILVUS_PORT: int = 19530
+    MILVUS_COLLECTION: str = "document_chunks"
+
+    # Celery 설정
+    CELERY_BROKER_URL: str = "redis://localhost:6379/0"
+    CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+
+    # 응답 캐시용 Redis URL (미설정 시 Celery 브로커 Redis 사용)
+    CACHE_REDIS_URL: Optional[str] = None
 
     # 기본 관리자 계정 설정
-    DEFAULT_ADMIN_EMAIL: str = os.getenv("DEFAULT_ADMIN_EMAIL", "admin@boardrag.com")
-    DEFAULT_ADMIN_PASSWORD: str = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin1234!")
-    CREATE_DEFAULT_ADMIN: bool = os.getenv("CREATE_DEFAULT_ADMIN", "True").lower() == "true"
+    DEFAULT_ADMIN_EMAIL: str = "admin@boardrag.com"
+    DEFAULT_ADMIN_PASSWORD: str = "admin1234!"
+    CREATE_DEFAULT_ADMIN: bool = True
     # 기본 사용자 계정 설정
-    DEFAULT_USER_EMAIL: str = os.getenv("DEFAULT_USER_EMAIL", "user@boardrag.com")
-    DEFAULT_USER_PASSWORD: str = os.getenv("DEFAULT_USER_PASSWORD", "user1234!")
-    DEFAULT_USER_NAME: str = os.getenv("DEFAULT_USER_NAME", "user")
-    CREATE_DEFAULT_USER: bool = os.getenv("CREATE_DEFAULT_USER", "True").lower() == "true"
+    DEFAULT_USER_EMAIL: str = "user@boardrag.com"
+    DEFAULT_USER_PASSWORD: str = "user1234!"
+    DEFAULT_USER_NAME: str = "user"
+    CREATE_DEFAULT_USER: bool = True
 
     class Config:
         case_sensitive = True
 
+    @model_validator(mode="after")
+    def build_derived_urls(self):
+        if not self.DATABASE_URL:
+            self.DATABASE_URL = (
+                f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+            )
+        if not self.CACHE_REDIS_URL:
+            self.CACHE_REDIS_URL = self.CELERY_BROKER_URL
+        return self
+
+    @model_validator(mode="after")
+    def check_connection_budget(self):
+        total = self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW + self.ASYNC_DB_POOL_SIZE + self.ASYNC_DB_MAX_OVERFLOW
+        if total > self.DB_CONNECTION_BUDGET:
+            raise ValueError(
+                f"동기/비동기 커넥션 풀 최대 연결 수 합({total})이 DB_CONNECTION_BUDGET({self.DB_CONNECTION_BUDGET})을 초과합니다"
+            )
+        return self
+
+
+# 설정은 프로세스당 한 번만 로드
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
+
 
 # 설정 인스턴스 생성
-settings = Settings()
+settings = get_settings()
@@ -1,27 +1,51 @@
+from contextlib import contextmanager
+
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 
 # 데이터베이스 엔진 생성
-engine = create_engine(settings.DATABASE_URL)
+# - 시간대는 접속 옵션으로 지정해 연결마다 SET 쿼리를 보내지 않음
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_use_lifo=True,
+    connect_args={"options": f"-c timezone={settings.DB_TIMEZONE}"},
+)
+
+# 비동기 데이터베이스 엔진 생성 (asyncpg)
+# - 동기 엔진과 풀이 분리되므로 두 풀의 합이 DB_CONNECTION_BUDGET 안에 들어가도록 크기를 나눔
+async_engine = create_async_engine(
+    # prepared statement 캐시를 사용해 반복 쿼리의 parse/plan 단계를 생략
+    make_url(settings.DATABASE_URL)
+    .set(drivername="postgresql+asyncpg")
+    .update_query_dict({"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)}),
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_use_lifo=True,
+    connect_args={"server_settings": {"timezone": settings.DB_TIMEZONE}},
+)
 
 # 세션 팩토리 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# - 커밋 후 객체를 만료시키지 않아 응답 직렬화 시 행을 다시 조회하지 않음
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# 비동기 세션 팩토리 생성
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Base 클래스 생성 (모든 모델의 베이스 클래스)
 Base = declarative_base()
 
 
-# PostgreSQL 연결 시 시간대 설정 이벤트 리스너
-@event.listens_for(engine, "connect")
-def set_timezone(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
-    cursor.execute("SET timezone='Asia/Seoul'")
-    cursor.close()
-
-
 # 데이터베이스 의존성
 def get_db():
     db = SessionLocal()
@@ -29,3 +53,28 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# 비동기 데이터베이스 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# 실행된 SQL 문을 기록하는 컨텍스트 매니저 (N+1 쿼리 회귀 점검용)
+# - 기본값으로 동기 엔진과 비동기 엔진(sync_engine)을 모두 감시
+@contextmanager
+def count_queries(*binds):
+    binds = binds or (engine, async_engine.sync_engine)
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for bind in binds:
+        event.listen(bind, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        for bind in binds:
+            event.remove(bind, "before_cursor_execute", _record)
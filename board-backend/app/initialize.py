@@ -1,4 +1,5 @@
 import logging
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.models import User, Tag
 from app.auth import get_password_hash
@@ -113,14 +114,11 @@ def create_default_tags(db: Session) -> None:
         {"name": "규정", "description": "규정/규칙 관련 문서", "is_system": True},
     ]
 
-    for tag_data in default_tags:
-        # 이미 존재하는 태그인지 확인
-        existing_tag = db.query(Tag).filter(Tag.name == tag_data["name"]).first()
-        if not existing_tag:
-            tag = Tag(**tag_data)
-            db.add(tag)
+    # 이미 존재하는 태그는 건너뛰고 한 번의 INSERT로 생성
+    stmt = pg_insert(Tag).values(default_tags).on_conflict_do_nothing(index_elements=["name"])
 
     try:
+        db.execute(stmt)
         db.commit()
     except Exception as e:
         db.rollback()
@@ -1,8 +1,17 @@
 from fastapi import FastAPI, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import AddConstraint, CreateIndex
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import OperationalError
 import os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경
+    fcntl = None
 
 from app.database import engine, Base, get_db
 from app.routers import auth, documents, admin, search, chunks, tasks
@@ -20,30 +29,141 @@ logger = logging.getLogger(__name__)
 # 개발 환경에서는 테이블을 재생성, 프로덕션에서는 필요에 따라 설정
 RECREATE_TABLES = os.getenv("RECREATE_TABLES", "True").lower() == "true"
 
-# 데이터베이스 테이블 생성 및 갱신
-try:
-    if RECREATE_TABLES:
+# 워커 간 DDL 실행을 직렬화하기 위한 잠금 파일
+DDL_LOCK_PATH = os.getenv("DDL_LOCK_PATH", "/tmp/board_ddl.lock")
+
+
+def _boot_id() -> Optional[str]:
+    """
+    같은 부모 프로세스(uvicorn 마스터/리로더)에서 뜬 워커들이 공유하는 부팅 식별자 (부모 PID + 부모 시작 시각)
+
+    컨테이너 재시작 시에는 부모 PID가 같아도 시작 시각이 달라지므로 새 부팅으로 구분됨
+    부모 정보를 읽을 수 없으면(단일 프로세스 실행 등) None 반환
+    """
+    ppid = os.getppid()
+    try:
+        with open(f"/proc/{ppid}/stat") as stat_file:
+            # 프로세스 이름에 공백이 있을 수 있으므로 마지막 ')' 이후 필드 기준으로 starttime(22번째 필드) 추출
+            start_time = stat_file.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+    return f"{ppid}:{start_time}"
+
+
+def _create_tables(recreate: bool = RECREATE_TABLES):
+    """데이터베이스 테이블 생성 및 갱신"""
+    if recreate:
         # 개발 환경: 테이블을 삭제하고 다시 생성
         logger.info("개발 환경 감지: RECREATE_TABLES=True")
         logger.info("기존 테이블 삭제 중...")
         Base.metadata.drop_all(bind=engine)
         logger.info("테이블 삭제 완료. 새 테이블을 생성합니다.")
+        Base.metadata.create_all(bind=engine)
+        logger.info("데이터베이스 테이블 생성 완료")
+        return
+
+    logger.info("프로덕션 환경 감지: 기존 테이블 유지, 필요한 경우 새 테이블만 생성")
+
+    # 테이블 목록을 한 번만 조회해서 없는 테이블만 생성 (테이블마다 존재 여부 확인 생략)
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing_tables = [table for table in Base.metadata.sorted_tables if table.name not in existing_tables]
+    if missing_tables:
+        Base.metadata.create_all(bind=engine, tables=missing_tables, checkfirst=False)
+        logger.info(f"누락된 테이블 생성 완료: {', '.join(table.name for table in missing_tables)}")
     else:
-        logger.info("프로덕션 환경 감지: 기존 테이블 유지, 필요한 경우 새 테이블만 생성")
+        logger.info("모든 테이블이 이미 존재합니다")
+
+    # create_all은 기존 테이블을 변경하지 않으므로 인덱스/외래 키 변경 사항은 별도로 반영
+    existing = [table for table in Base.metadata.sorted_tables if table.name in existing_tables]
+    if existing:
+        _sync_existing_tables(inspector, existing)
 
-    # 테이블 생성
-    Base.metadata.create_all(bind=engine)
-    logger.info("데이터베이스 테이블 생성 완료")
 
-except OperationalError as e:
-    logger.error(f"데이터베이스 연결 실패. 테이블을 생성할 수 없습니다. 오류: {str(e)}")
-    # 가능한 경우 연결 재시도나 대체 동작 구현
-    logger.info("데이터베이스 연결 문제: PostgreSQL 서비스가 실행 중인지 확인하십시오")
-    logger.info(f"현재 설정된 DATABASE_URL: {os.getenv('DATABASE_URL', '미설정')}")
+# 이전 스키마에서 새 인덱스로 대체된 인덱스 (새 인덱스 생성 후 삭제)
+_OBSOLETE_INDEXES = (
+    "ix_users_email",  # -> idx_user_email_covering
+    "idx_tag_name",  # -> tags.name 유일성 인덱스 (기존 DB는 ix_tags_name, 새 DB는 UNIQUE 제약)
+    "idx_document_status",  # -> idx_document_status_created_at
+    "idx_chunk_document_id",  # -> idx_chunk_document_index
+)
+
+
+def _sync_existing_tables(inspector, tables):
+    """
+    기존 테이블에 모델의 인덱스와 외래 키 ON DELETE 옵션을 반영 (멱등)
+
+    - 인덱스는 CREATE INDEX IF NOT EXISTS로 없는 것만 생성 (최초 한 번은 테이블 크기에 비례해 쓰기가 잠김)
+    - ON DELETE 옵션이 모델과 다른 외래 키는 삭제 후 다시 생성
+    """
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for table in tables:
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
+            current_fks = {tuple(fk["constrained_columns"]): fk for fk in inspector.get_foreign_keys(table.name)}
+            for constraint in table.foreign_key_constraints:
+                current = current_fks.get(tuple(constraint.column_keys))
+                if current is None:
+                    continue
+                current_ondelete = (current["options"].get("ondelete") or "").upper()
+                if current_ondelete == (constraint.ondelete or "").upper():
+                    continue
+                constraint_name = conn.dialect.identifier_preparer.quote(current["name"])
+                conn.execute(text(f"ALTER TABLE {table.name} DROP CONSTRAINT {constraint_name}"))
+                conn.execute(AddConstraint(constraint))
+                columns = ", ".join(constraint.column_keys)
+                logger.info(f"외래 키 갱신: {table.name}({columns}) ON DELETE {constraint.ondelete}")
+
+        for index_name in _OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+    logger.info("기존 테이블 인덱스/외래 키 동기화 완료")
+
+
+def init_database():
+    """파일 잠금으로 워커 간 DDL 실행을 직렬화하여 테이블을 준비합니다. (테이블 재생성은 부팅당 한 번)"""
+    try:
+        if fcntl is None:
+            _create_tables()
+            return
+
+        # 워커들의 DDL이 동시에 실행되지 않도록 직렬화
+        # - 누락 테이블 생성은 멱등이므로 워커마다 실행
+        # - 테이블 삭제 후 재생성(RECREATE_TABLES)은 부팅당 한 번만 실행 (뒤늦게 뜬 워커가 먼저 뜬 워커의
+        #   초기 데이터를 지우지 않도록 잠금 파일에 이번 부팅 식별자를 기록)
+        boot_id = _boot_id()
+        with open(DDL_LOCK_PATH, "a+") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                recreate = RECREATE_TABLES
+                if recreate and boot_id:
+                    lock_file.seek(0)
+                    if lock_file.read().strip() == boot_id:
+                        logger.info("이번 부팅에서 이미 테이블을 재생성했습니다. 누락된 테이블만 확인합니다.")
+                        recreate = False
+                _create_tables(recreate)
+                if recreate and boot_id:
+                    lock_file.seek(0)
+                    lock_file.truncate()
+                    lock_file.write(boot_id)
+                    lock_file.flush()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    except OperationalError as e:
+        logger.error(f"데이터베이스 연결 실패. 테이블을 생성할 수 없습니다. 오류: {str(e)}")
+        # 가능한 경우 연결 재시도나 대체 동작 구현
+        logger.info("데이터베이스 연결 문제: PostgreSQL 서비스가 실행 중인지 확인하십시오")
+        logger.info(f"현재 설정된 DATABASE_URL: {os.getenv('DATABASE_URL', '미설정')}")
+
 
 # FastAPI 애플리케이션 생성
 app = FastAPI(
-    title="Board RAG System API", description="문서 업로드 및 RAG 기반 검색 시스템을 위한 API", version="0.1.0"
+    title="Board RAG System API",
+    description="문서 업로드 및 RAG 기반 검색 시스템을 위한 API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,  # orjson으로 JSON 직렬화
 )
 
 # CORS 설정
@@ -61,17 +181,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# 라우터 포함
-app.include_router(auth.router, prefix="/api")
-app.include_router(documents.router, prefix="/api")
-app.include_router(admin.router, prefix="/api")
-app.include_router(search.router, prefix="/api")
-app.include_router(chunks.router, prefix="/api")
-app.include_router(tasks.router, prefix="/api")
-app.include_router(tags.router, prefix="/api")  # 사용자 태그 라우터 추가
-app.include_router(admin_tags.router, prefix="/api")  # 관리자 태그 라우터 추가
+# 라우터 포함 (관리자 라우터는 라우터 단위로 관리자 권한 의존성이 적용되어 있음)
+for module in (auth, documents, admin, search, chunks, tasks, tags, admin_tags):
+    app.include_router(module.router, prefix="/api")
 
 
 @app.get("/api/health", tags=["health"])
@@ -106,6 +221,9 @@ async def startup_event():
     """애플리케이션 시작 시 실행되는 함수"""
     logger.info("애플리케이션 시작 중...")
 
+    # 데이터베이스 테이블 준비
+    init_database()
+
     # 데이터베이스 세션 얻기
     db = next(get_db())
     try:
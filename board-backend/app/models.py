@@ -1,17 +1,24 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean, Text, ARRAY, JSON, Index, Float, func
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean, Text, JSON, Index, Float, func, text
+from sqlalchemy import DDL, delete, event
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 
 
+# 트라이그램 인덱스(gin_trgm_ops)와 similarity()에 필요한 확장을 테이블 생성 전에 활성화
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email = Column(String, unique=True, index=True)
+    # 서버 기본값이 없는 기존 테이블에서도 INSERT가 동작하도록 애플리케이션 기본값(uuid4)을 함께 유지 (모든 PK 공통)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
+    email = Column(String)  # 유일성은 idx_user_email_covering 인덱스로 보장
     name = Column(String, nullable=True)
     contact_email = Column(String, nullable=True)
     hashed_password = Column(String)
@@ -32,11 +39,25 @@ class User(Base):
         cascade="all, delete-orphan",
     )
 
+    # 인덱스 생성
+    __table_args__ = (
+        # 로그인 조회 시 힙 접근 없이 인덱스만으로 처리 (이메일 유일성 보장 겸용)
+        # - WHERE is_active 부분 인덱스로 만들지 않음: 비활성 사용자 이메일까지 유일성을 보장해야 하고,
+        #   로그인 조회는 is_active로 거르지 않음 (비활성 여부는 인증 후 get_current_active_user에서 확인)
+        Index(
+            "idx_user_email_covering",
+            email,
+            unique=True,
+            postgresql_include=["id", "hashed_password", "role", "is_active", "is_approved"],
+        ),
+        Index("idx_user_approved_active", is_approved, is_active),  # 관리자 사용자 목록 필터링 가속
+    )
+
 
 class Document(Base):
     __tablename__ = "documents"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     title = Column(String, nullable=False, index=True)
     summary = Column(Text, nullable=True)
     tags = Column(ARRAY(String), nullable=True)
@@ -65,24 +86,61 @@ class Document(Base):
     user = relationship("User", back_populates="documents")
 
     # 문서 파일과의 관계
-    files = relationship("DocumentFile", back_populates="document", cascade="all, delete-orphan")
+    files = relationship("DocumentFile", back_populates="document", cascade="all, delete-orphan", passive_deletes=True)
 
     # 청크와의 관계 추가
-    chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
+    chunks = relationship(
+        "DocumentChunk", back_populates="document", cascade="all, delete-orphan", passive_deletes=True
+    )
 
     def __repr__(self):
         return f"<Document(id={self.id}, title='{self.title}', status='{self.status}')>"
 
+    # 응답 스키마용 파일 정보 (files 관계가 로드된 경우에만 계산, 지연 로딩 방지)
+    def _loaded_files(self):
+        if "files" in sa_inspect(self).unloaded:
+            return None
+        return self.files
+
+    @property
+    def file_names(self):
+        files = self._loaded_files()
+        return None if files is None else [file.original_filename for file in files]
+
+    @property
+    def file_paths(self):
+        files = self._loaded_files()
+        return None if files is None else [file.file_path for file in files]
+
+    @property
+    def file_types(self):
+        files = self._loaded_files()
+        return None if files is None else [file.file_type for file in files]
+
     # 인덱스 생성
     __table_args__ = (
-        Index("idx_document_status", status),  # 상태별 필터링 가속
+        # 상태별 필터링 + 최신순 페이지네이션 가속
+        Index("idx_document_status_created_at", status, created_at.desc()),
         Index("idx_document_created_at", created_at),  # 생성일 기준 정렬 가속
         Index("idx_document_tags", tags, postgresql_using="gin"),  # 태그 검색 가속 (GIN 인덱스)
         Index("idx_document_user_status", user_id, status),  # 사용자별 상태 필터링 가속
         Index("idx_document_dates", start_date, end_date),  # 날짜 범위 검색 가속
         Index("idx_document_public", is_public),  # 공개 문서 필터링 가속
+        # 목록 조회의 접근 조건 (내 문서 OR 공개+승인 문서)을 각 분기별 인덱스 스캔으로 처리 (최신순 정렬 포함)
+        Index(
+            "idx_document_public_approved_created_at",
+            created_at.desc(),
+            postgresql_where=(is_public == True) & (status == "승인완료"),
+        ),
+        Index("idx_document_user_created_at", user_id, created_at.desc()),
+        # 제목 키워드/패턴/유사도 검색 가속 (pg_trgm 트라이그램 GIN 인덱스)
+        Index("idx_document_title_trgm", title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
     )
 
+    # INSERT/UPDATE 시 서버 생성 값(created_at/updated_at)을 RETURNING으로 함께 받아옴
+    # (비동기 세션에서 커밋 후 만료된 속성을 지연 로딩하지 않도록)
+    __mapper_args__ = {"eager_defaults": True}
+
 
 # 태그 관련 모델 추가
 class Tag(Base):
@@ -90,8 +148,8 @@ class Tag(Base):
 
     __tablename__ = "tags"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(String, nullable=False, unique=True, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
+    name = Column(String, nullable=False, unique=True)  # UNIQUE 제약의 인덱스로 이름 검색 처리
     description = Column(String, nullable=True)
     is_system = Column(Boolean, default=False)  # 시스템 제공 태그 여부
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -102,7 +160,6 @@ class Tag(Base):
     user_tags = relationship("UserTag", back_populates="tag", cascade="all, delete-orphan")
 
     __table_args__ = (
-        Index("idx_tag_name", name),  # 태그 이름으로 검색 가속
         Index("idx_tag_system", is_system),  # 시스템 태그 필터링 가속
     )
 
@@ -115,7 +172,7 @@ class UserTag(Base):
 
     __tablename__ = "user_tags"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     tag_id = Column(UUID(as_uuid=True), ForeignKey("tags.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -138,7 +195,7 @@ class UserTagQuota(Base):
 
     __tablename__ = "user_tag_quotas"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True)
     max_tags = Column(Integer, default=20)  # 기본 최대 20개 태그 할당
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -157,7 +214,7 @@ class DocumentFile(Base):
 
     __tablename__ = "document_files"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     file_path = Column(String, nullable=False)  # MinIO 내 파일 경로
     original_filename = Column(String, nullable=False)  # 원본 파일명
     file_type = Column(String, nullable=False)  # 파일 유형
@@ -173,7 +230,7 @@ class DocumentFile(Base):
     error_message = Column(String, nullable=True)
 
     # 외래 키
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"))
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"))
 
     # 관계 설정
     document = relationship("Document", back_populates="files")
@@ -188,7 +245,7 @@ class DocumentFile(Base):
 class DocumentChunk(Base):
     __tablename__ = "document_chunks"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     chunk_text = Column(Text)
     chunk_index = Column(Integer)
     vector_id = Column(String)  # Milvus 벡터 ID
@@ -199,7 +256,7 @@ class DocumentChunk(Base):
     embedding_version = Column(String, nullable=True)  # 임베딩 모델 버전
 
     # 외래 키
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"))
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"))
 
     # 관계 설정
     document = relationship("Document", back_populates="chunks")
@@ -207,6 +264,26 @@ class DocumentChunk(Base):
 
     # 인덱스 생성
     __table_args__ = (
-        Index("idx_chunk_document_id", document_id),  # 문서별 청크 검색 가속
+        Index("idx_chunk_document_index", document_id, chunk_index),  # 문서별 청크 검색 + 순서 정렬 가속
         Index("idx_chunk_file_id", file_id),  # 파일별 청크 검색 가속
+        # 본문 키워드 검색(ILIKE '%키워드%') 및 similarity 계산 가속 (pg_trgm 트라이그램 GIN 인덱스)
+        Index(
+            "idx_chunk_text_trgm",
+            chunk_text,
+            postgresql_using="gin",
+            postgresql_ops={"chunk_text": "gin_trgm_ops"},
+        ),
+    )
+
+
+def document_child_deletes(document_id):
+    """
+    문서 삭제 전에 실행할 하위 레코드 삭제 쿼리 (청크 → 파일 순서)
+
+    ON DELETE CASCADE가 없는 기존 데이터베이스에서도 외래 키 위반 없이 문서를 삭제하기 위해 사용
+    파일 삭제 쿼리는 MinIO 정리를 위해 삭제된 파일 경로를 반환함
+    """
+    return (
+        delete(DocumentChunk).where(DocumentChunk.document_id == document_id),
+        delete(DocumentFile).where(DocumentFile.document_id == document_id).returning(DocumentFile.file_path),
     )
@@ -1,89 +1,118 @@
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import select, update, delete, func, text, cast, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
 from uuid import UUID
+from collections import defaultdict
 from datetime import datetime
 import logging
 
-from app.database import get_db
-from app.auth import get_current_admin_user
+from app.database import get_db, get_async_db
+from app.auth import get_current_admin_user, invalidate_user_cache
+from app.cache import acache_get, acache_set, cache_clear
 from app.schemas import Document, DocumentStatusUpdate, DocumentDetail, User as UserSchema
-from app.models import Document as DocumentModel, User, DocumentFile, DocumentChunk
+from app.models import Document as DocumentModel, User, DocumentFile, DocumentChunk, document_child_deletes
+from app.routers.search import SEARCH_CACHE
 from app.utils.vectorizer import chunk_document, simple_chunk_document
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+# 모든 엔드포인트에 관리자 권한 확인을 라우터 단위로 적용
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_admin_user)])
 
 
-# 관리자 통계 API
-@router.get("/stats")
-def get_admin_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
-):
-    """관리자용 - 시스템 통계 정보를 제공합니다."""
-    try:
-        # 승인 대기 중인 문서 수
-        pending_approval_count = (
-            db.query(func.count(DocumentModel.id)).filter(DocumentModel.status == "승인대기").scalar()
-        )
+def jsonb_patch(column, patch: Dict[str, Any]):
+    """JSONB 컬럼에 patch 딕셔너리를 병합하는 SQL 표현식을 반환합니다."""
+    return func.coalesce(column, cast({}, JSONB)).op("||")(cast(patch, JSONB))
 
-        # 승인된 문서 수
-        approved_count = db.query(func.count(DocumentModel.id)).filter(DocumentModel.status == "승인완료").scalar()
 
-        # 전체 문서 수
-        total_documents = db.query(func.count(DocumentModel.id)).scalar()
+def _patch_document(db: Session, document_id: UUID, patch: Optional[Dict[str, Any]] = None, **values):
+    """문서 컬럼과 file_metadata(서버 측 JSONB 병합)를 한 번의 UPDATE로 변경하고 변경된 문서를 반환합니다."""
+    if patch:
+        values["file_metadata"] = jsonb_patch(DocumentModel.file_metadata, patch)
+    stmt = (
+        update(DocumentModel)
+        .where(DocumentModel.id == document_id)
+        .values(**values)
+        .returning(DocumentModel)
+        .execution_options(populate_existing=True)
+    )
+    return db.scalars(stmt).one_or_none()
 
-        # 전체 사용자 수
-        total_users = db.query(func.count(User.id)).scalar()
 
-        # 승인 대기 중인 사용자 수
-        pending_user_approval = (
-            db.query(func.count(User.id)).filter(User.is_approved == False, User.is_active == True).scalar()
-        )
+# 문서 목록 정렬 허용 컬럼 (그 외 값은 created_at으로 처리)
+_SORT_COLUMNS = {
+    "created_at": DocumentModel.created_at,
+    "updated_at": DocumentModel.updated_at,
+    "title": DocumentModel.title,
+}
 
-        # 총 문서 파일 수
-        total_files = db.query(func.count(DocumentFile.id)).scalar()
+# 관리자 통계용 건수 집계 쿼리 (한 번의 왕복으로 처리)
+_STATS_COUNTS_QUERY = text(
+    """
+    WITH d AS (
+        SELECT count(*) FILTER (WHERE status = '승인대기') AS pending_approval,
+               count(*) FILTER (WHERE status = '승인완료') AS approved_documents,
+               count(*) AS total_documents,
+               count(*) FILTER (WHERE vectorized) AS vectorized_documents
+        FROM documents
+    ),
+    u AS (
+        SELECT count(*) AS total_users,
+               count(*) FILTER (WHERE NOT is_approved AND is_active) AS pending_user_approval
+        FROM users
+    ),
+    f AS (SELECT count(*) AS total_files FROM document_files),
+    c AS (SELECT count(*) AS total_chunks FROM document_chunks)
+    SELECT * FROM d, u, f, c
+    """
+)
 
-        # 벡터화된 문서 수
-        vectorized_docs = db.query(func.count(DocumentModel.id)).filter(DocumentModel.vectorized == True).scalar()
+# 관리자 통계 캐시 설정
+ADMIN_STATS_CACHE = "admin_stats"
+ADMIN_STATS_CACHE_TTL = 30
 
-        # 총 청크 수
-        total_chunks = db.query(func.count(DocumentChunk.id)).scalar()
+# 상위 10개 태그 집계 쿼리
+_TOP_TAGS_QUERY = text(
+    "SELECT tag, COUNT(*) AS doc_count FROM documents, unnest(tags) AS tag "
+    "WHERE tags IS NOT NULL GROUP BY tag ORDER BY doc_count DESC LIMIT 10"
+)
 
-        # 태그별 문서 수 (상위 10개)
-        tag_counts = []
-        documents = db.query(DocumentModel.tags).all()
-        tag_dict = {}
 
-        for doc in documents:
-            if doc.tags:
-                for tag in doc.tags:
-                    if tag in tag_dict:
-                        tag_dict[tag] += 1
-                    else:
-                        tag_dict[tag] = 1
-
-        # 상위 10개 태그만 추출
-        tag_counts = [
-            {"tag": tag, "count": count}
-            for tag, count in sorted(tag_dict.items(), key=lambda x: x[1], reverse=True)[:10]
-        ]
+# 관리자 통계 API
+@router.get("/stats")
+async def get_admin_stats(
+    db: AsyncSession = Depends(get_async_db),
+):
+    """관리자용 - 시스템 통계 정보를 제공합니다."""
+    # 캐시된 통계가 있으면 바로 반환
+    cached_stats = await acache_get(ADMIN_STATS_CACHE)
+    if cached_stats is not None:
+        return cached_stats
+
+    try:
+        # 문서/사용자/파일/청크 수를 한 번의 쿼리로 집계
+        counts = (await db.execute(_STATS_COUNTS_QUERY)).one()
+
+        # 태그별 문서 수 (상위 10개) - DB에서 집계
+        tag_rows = (await db.execute(_TOP_TAGS_QUERY)).all()
+        tag_counts = [{"tag": row.tag, "count": row.doc_count} for row in tag_rows]
 
         # 통계 결과 반환
         stats = {
-            "pending_approval": pending_approval_count,
-            "approved_documents": approved_count,
-            "total_documents": total_documents,
-            "total_users": total_users,
-            "pending_user_approval": pending_user_approval,
-            "total_files": total_files,
-            "vectorized_documents": vectorized_docs,
-            "total_chunks": total_chunks,
+            "pending_approval": counts.pending_approval,
+            "approved_documents": counts.approved_documents,
+            "total_documents": counts.total_documents,
+            "total_users": counts.total_users,
+            "pending_user_approval": counts.pending_user_approval,
+            "total_files": counts.total_files,
+            "vectorized_documents": counts.vectorized_documents,
+            "total_chunks": counts.total_chunks,
             "top_tags": tag_counts,
             "timestamp": datetime.now().isoformat(),
         }
 
+        await acache_set(ADMIN_STATS_CACHE, "", stats, ADMIN_STATS_CACHE_TTL)
         return stats
 
     except Exception as e:
@@ -102,7 +131,6 @@ def get_all_users(
     is_approved: Optional[bool] = None,
     is_active: Optional[bool] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
 ):
     """관리자용 - 모든 사용자 목록을 조회합니다."""
     query = db.query(User)
@@ -121,27 +149,43 @@ def get_all_users(
     return users
 
 
+def _update_user_status(db: Session, user_id: UUID, criteria, **values) -> Optional[UserSchema]:
+    """조건을 만족하는 사용자 상태를 한 번의 UPDATE ... RETURNING으로 변경합니다. 변경 대상이 없으면 None"""
+    stmt = (
+        update(User)
+        .where(User.id == user_id, *criteria)
+        .values(**values)
+        .returning(User)
+        .execution_options(populate_existing=True)
+    )
+    user = db.scalars(stmt).one_or_none()
+    if user is None:
+        return None
+
+    # 커밋 후 만료로 인한 재조회를 피하기 위해 응답을 먼저 생성
+    response = UserSchema.model_validate(user, from_attributes=True)
+    db.commit()
+    invalidate_user_cache(user_id)
+    cache_clear(ADMIN_STATS_CACHE)
+    return response
+
+
 # 사용자 승인 API (관리자용)
 @router.post("/users/{user_id}/approve", response_model=UserSchema)
 def approve_user(
     user_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
 ):
     """관리자용 - 사용자 계정을 승인합니다."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _update_user_status(db, user_id, [User.is_approved == False], is_approved=True)
+    if user:
+        return user
 
+    # 변경 대상이 없는 경우: 존재하지 않거나 이미 승인된 사용자
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    # 이미 승인된 사용자인 경우
-    if user.is_approved:
-        return user
-
-    user.is_approved = True
-    db.commit()
-    db.refresh(user)
-
     return user
 
 
@@ -150,23 +194,19 @@ def approve_user(
 def deactivate_user(
     user_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
 ):
     """관리자용 - 사용자 계정을 비활성화합니다."""
-    user = db.query(User).filter(User.id == user_id).first()
+    # 관리자는 비활성화할 수 없음
+    user = _update_user_status(db, user_id, [User.role != "admin"], is_active=False)
+    if user:
+        return user
 
+    # 변경 대상이 없는 경우: 존재하지 않거나 관리자
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    # 관리자는 비활성화할 수 없음
-    if user.role == "admin":
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot deactivate admin user")
-
-    user.is_active = False
-    db.commit()
-    db.refresh(user)
-
-    return user
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot deactivate admin user")
 
 
 # 사용자 활성화 API (관리자용)
@@ -174,105 +214,109 @@ def deactivate_user(
 def activate_user(
     user_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
 ):
     """관리자용 - 비활성화된 사용자 계정을 다시 활성화합니다."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _update_user_status(db, user_id, [User.is_active == False], is_active=True)
+    if user:
+        return user
 
+    # 변경 대상이 없는 경우: 존재하지 않거나 이미 활성화된 사용자
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    # 이미 활성화된 사용자인 경우
-    if user.is_active:
-        return user
-
-    user.is_active = True
-    db.commit()
-    db.refresh(user)
-
     return user
 
 
 # 전체 문서 목록 조회 API (관리자용)
 @router.get("/documents", response_model=List[Document])
-def get_all_documents(
+async def get_all_documents(
+    response: Response,
     status: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
     sort_by: str = "created_at",
     sort_order: str = "desc",
     tag: Optional[List[str]] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
+    """관리자용 - 전체 문서 목록을 조회합니다.
+
+    created_at 정렬 시 after_created_at/after_id(이전 페이지 마지막 문서)를 주면 skip 대신 키셋 페이지네이션을 사용하며,
+    다음 페이지 커서는 X-Next-Cursor 헤더("created_at,id")로 반환합니다.
+    """
     try:
-        # 문서와 파일 조인 쿼리 최적화
-        query = db.query(DocumentModel).options(
-            selectinload(DocumentModel.files).load_only(
-                DocumentFile.original_filename, DocumentFile.file_path, DocumentFile.file_type
-            )
-        )
+        # 문서만 조회 (파일 정보는 아래에서 필요한 컬럼만 별도로 조회)
+        query = select(DocumentModel).options(raiseload("*"))
 
         # 상태별 필터링
         if status:
-            query = query.filter(DocumentModel.status == status)
+            query = query.where(DocumentModel.status == status)
 
-        # 태그 필터링
+        # 태그 필터링 (모든 태그 포함, GIN 인덱스 사용)
         if tag:
-            for t in tag:
-                query = query.filter(DocumentModel.tags.any(t))
+            query = query.where(DocumentModel.tags.contains(tag))
 
         # 정렬 설정
-        if sort_order.lower() == "asc":
-            order_func = getattr(getattr(DocumentModel, sort_by), "asc")
+        sort_column = _SORT_COLUMNS.get(sort_by, DocumentModel.created_at)
+        ascending = sort_order.lower() == "asc"
+        keyset = sort_column is DocumentModel.created_at
+
+        if keyset:
+            # (created_at, id) 순서로 정렬해 키셋 페이지네이션 기준을 고정
+            order_by = (
+                (DocumentModel.created_at.asc(), DocumentModel.id.asc())
+                if ascending
+                else (DocumentModel.created_at.desc(), DocumentModel.id.desc())
+            )
         else:
-            order_func = getattr(getattr(DocumentModel, sort_by), "desc")
+            order_by = (sort_column.asc() if ascending else sort_column.desc(),)
 
-        # 정렬 및 페이지네이션 적용
-        documents = query.order_by(order_func()).offset(skip).limit(limit).all()
+        query = query.order_by(*order_by)
+
+        # 페이지네이션 적용 (커서가 있으면 OFFSET 없이 인덱스 범위 조회)
+        if keyset and after_created_at is not None and after_id is not None:
+            position = tuple_(DocumentModel.created_at, DocumentModel.id)
+            cursor = tuple_(after_created_at, after_id)
+            query = query.where(position > cursor if ascending else position < cursor)
+        else:
+            query = query.offset(skip)
+
+        documents = (await db.scalars(query.limit(limit))).all()
+
+        # 다음 페이지 커서
+        if keyset and documents and len(documents) == limit:
+            last = documents[-1]
+            response.headers["X-Next-Cursor"] = f"{last.created_at.isoformat()},{last.id}"
+
+        # 페이지 문서들의 파일 정보를 ORM 객체 대신 Row 튜플로 한 번에 조회해 문서별로 묶음
+        files_by_document = defaultdict(list)
+        if documents:
+            file_rows = await db.execute(
+                select(
+                    DocumentFile.document_id,
+                    DocumentFile.original_filename,
+                    DocumentFile.file_path,
+                    DocumentFile.file_type,
+                ).where(DocumentFile.document_id.in_([doc.id for doc in documents]))
+            )
+            for row in file_rows:
+                files_by_document[row.document_id].append(row)
 
-        # 파일 정보 포함하여 응답 준비
         result = []
         for doc in documents:
-            # 문서 기본 정보 직접 매핑 (SQLAlchemy 객체에서 필요한 필드만 추출)
-            doc_dict = {
-                "id": doc.id,
-                "title": doc.title,
-                "summary": doc.summary,
-                "tags": doc.tags,
-                "status": doc.status,
-                "created_at": doc.created_at,
-                "updated_at": doc.updated_at,
-                "user_id": doc.user_id,
-                "start_date": doc.start_date,
-                "end_date": doc.end_date,
-                "view_count": doc.view_count,
-                "download_count": doc.download_count,
-                "vectorized": doc.vectorized,
-                "file_metadata": doc.file_metadata,
-            }
-
-            # 파일 정보 추가
-            file_names = []
-            file_paths = []
-            file_types = []
-
-            if doc.files:
-                for file in doc.files:
-                    file_names.append(file.original_filename)
-                    file_paths.append(file.file_path)
-                    file_types.append(file.file_type)
-
-            doc_dict["file_names"] = file_names
-            doc_dict["file_paths"] = file_paths
-            doc_dict["file_types"] = file_types
-
-            result.append(doc_dict)
-        print(result)
+            files = files_by_document.get(doc.id, [])
+            item = Document.model_validate(doc, from_attributes=True)
+            item.file_names = [file.original_filename for file in files]
+            item.file_paths = [file.file_path for file in files]
+            item.file_types = [file.file_type for file in files]
+            result.append(item)
         return result
     except Exception as e:
         # 디버깅을 위한 오류 로깅
-        print(f"관리자 문서 목록 조회 오류: {str(e)}")
+        logging.exception(f"관리자 문서 목록 조회 오류: {str(e)}")
         raise
 
 
@@ -281,24 +325,19 @@ def get_all_documents(
 def approve_document(
     document_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)
 ):
-    document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
+    # 문서 상태 변경 및 승인 메타데이터 추가
+    patch = {"approved_by": str(current_user.id), "approved_at": datetime.utcnow().isoformat()}
+    document = _patch_document(db, document_id, patch, status="승인완료")
 
     if not document:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
 
-    # 문서 상태 변경
-    document.status = "승인완료"
-
-    # 승인 메타데이터 추가
-    metadata = document.file_metadata or {}
-    metadata["approved_by"] = str(current_user.id)
-    metadata["approved_at"] = datetime.utcnow().isoformat()
-    document.file_metadata = metadata
-
+    response = Document.model_validate(document, from_attributes=True)
     db.commit()
-    db.refresh(document)
+    cache_clear(ADMIN_STATS_CACHE)
+    cache_clear(SEARCH_CACHE)
 
-    return document
+    return response
 
 
 # 문서 거부 API (관리자용)
@@ -309,94 +348,72 @@ def reject_document(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
-    document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
-
-    if not document:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    # 거부 이유가 있으면 메타데이터에 추가
+    patch = None
+    if reason:
+        patch = {
+            "reject_reason": reason,
+            "rejected_by": str(current_user.id),
+            "rejected_at": datetime.utcnow().isoformat(),
+        }
 
     # 문서 상태 변경
-    document.status = "승인대기"
+    document = _patch_document(db, document_id, patch, status="승인대기")
 
-    # 거부 이유가 있으면 메타데이터에 추가
-    if reason:
-        metadata = document.file_metadata or {}
-        metadata["reject_reason"] = reason
-        metadata["rejected_by"] = str(current_user.id)
-        metadata["rejected_at"] = datetime.utcnow().isoformat()
-        document.file_metadata = metadata
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
 
+    response = Document.model_validate(document, from_attributes=True)
     db.commit()
-    db.refresh(document)
+    cache_clear(ADMIN_STATS_CACHE)
+    cache_clear(SEARCH_CACHE)
 
-    return document
+    return response
 
 
 # 문서 삭제 API (관리자용)
 @router.delete("/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_document(
-    document_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)
-):
+def delete_document(document_id: UUID, db: Session = Depends(get_db)):
     """
     문서와 관련된 모든 데이터를 삭제합니다:
-    1. 문서 청크 및 벡터 데이터
-    2. MinIO에 저장된 파일
-    3. 문서 파일 레코드
-    4. 문서 자체
+    1. 문서 자체와 청크 및 파일 레코드 (한 트랜잭션에서 하위 레코드부터 삭제)
+    2. MinIO에 저장된 파일 (커밋 이후 Celery 태스크로 비동기 삭제)
     """
-    # 관리자 권한 확인
-    if current_user.role != "admin":
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다")
-
-    # 문서 존재 확인
-    document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
-
-    if not document:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
-
     try:
-        # 트랜잭션 시작 - 삭제 작업을 하나의 트랜잭션으로 처리
+        # 1. 청크/파일 레코드 삭제 (기존 DB의 외래 키에는 CASCADE가 없으므로 명시적으로 삭제)
+        #    파일 삭제 시 반환된 경로는 MinIO 정리에 사용
+        delete_chunks, delete_files = document_child_deletes(document_id)
+        db.execute(delete_chunks)
+        file_paths = list(db.scalars(delete_files))
 
-        # 1. 문서 청크 및 벡터 데이터 삭제
-        chunk_count = db.query(DocumentChunk).filter(DocumentChunk.document_id == document_id).delete()
-        logging.info(f"Deleted {chunk_count} chunks for document {document_id}")
+        # 2. 문서 삭제
+        deleted_id = db.execute(
+            delete(DocumentModel).where(DocumentModel.id == document_id).returning(DocumentModel.id)
+        ).scalar_one_or_none()
 
-        # 2. MinIO에서 파일 삭제 (먼저 파일 경로 수집)
-        # 문서와 연결된 모든 파일 정보 조회
-        document_files = db.query(DocumentFile).filter(DocumentFile.document_id == document_id).all()
+        if deleted_id is None:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
 
-        # 파일 경로 리스트 생성
-        file_paths = [file.file_path for file in document_files]
+        # 모든 변경사항 커밋
+        db.commit()
+        cache_clear(ADMIN_STATS_CACHE)
+        cache_clear(SEARCH_CACHE)
+        logging.info(f"Successfully deleted document {document_id} and all related data")
 
-        # MinIO에서 파일 삭제
+        # MinIO 파일 삭제는 커밋 이후 Celery 태스크로 처리
         if file_paths:
             try:
-                # storage.py 모듈의 delete_multiple_files 함수 사용
-                from app.storage import delete_multiple_files
-
-                # 파일 삭제 실행 및 결과 로깅
-                success, failed_files = delete_multiple_files(file_paths)
-
-                if not success:
-                    # 일부 파일 삭제 실패 시 경고 로그
-                    logging.warning(f"Failed to delete some files: {failed_files}")
+                from app.tasks.storage_tasks import delete_files_task
 
-                logging.info(f"Deleted {len(file_paths)} files from MinIO for document {document_id}")
+                delete_files_task.delay(file_paths)
             except Exception as file_error:
-                # 파일 삭제 실패해도 계속 진행
-                logging.error(f"Failed to delete files for document {document_id}: {str(file_error)}")
-
-        # 3. 데이터베이스에서 문서 관련 파일 레코드 삭제
-        file_count = db.query(DocumentFile).filter(DocumentFile.document_id == document_id).delete()
-        logging.info(f"Deleted {file_count} file records for document {document_id}")
-
-        # 4. 데이터베이스에서 문서 삭제
-        db.delete(document)
-
-        # 모든 변경사항 커밋
-        db.commit()
-        logging.info(f"Successfully deleted document {document_id} and all related data")
+                # 태스크 등록 실패해도 문서 삭제는 완료된 상태
+                logging.error(f"Failed to queue file deletion for document {document_id}: {str(file_error)}")
 
         return {"message": "Document and all related data deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         # 오류 발생 시 롤백
         db.rollback()
@@ -417,43 +434,38 @@ def approve_documents_batch(
     if not document_ids:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No document IDs provided")
 
-    # 해당 ID의 문서들 조회
-    documents = db.query(DocumentModel).filter(DocumentModel.id.in_(document_ids)).all()
-
-    # ID별 문서 매핑 생성 (빠른 접근을 위해)
-    doc_map = {str(doc.id): doc for doc in documents}
-
-    # 찾지 못한 문서 ID 확인
-    found_ids = [str(doc.id) for doc in documents]
-    missing_ids = [str(doc_id) for doc_id in document_ids if str(doc_id) not in found_ids]
+    # 찾지 못한 문서 ID 확인 (이미 승인된 문서도 응답에 포함하므로 문서 전체를 조회)
+    documents = db.scalars(select(DocumentModel).where(DocumentModel.id.in_(document_ids))).all()
+    existing_ids = {doc.id for doc in documents}
+    missing_ids = [str(doc_id) for doc_id in document_ids if doc_id not in existing_ids]
 
     if missing_ids:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"Documents not found: {', '.join(missing_ids)}"
         )
 
-    # 모든 문서를 승인 상태로 변경
-    for document in documents:
-        # 이미 승인된 문서는 건너뜀
-        if document.status == "승인완료":
-            continue
-
-        # 문서 상태 변경
-        document.status = "승인완료"
-
-        # 승인 메타데이터 추가
-        metadata = document.file_metadata or {}
-        metadata["approved_by"] = str(current_user.id)
-        metadata["approved_at"] = datetime.utcnow().isoformat()
-        metadata["batch_approval"] = True
-        document.file_metadata = metadata
+    # 승인되지 않은 문서만 한 번의 UPDATE로 승인 처리 (RETURNING 결과로 위에서 조회한 객체를 갱신)
+    patch = {
+        "approved_by": str(current_user.id),
+        "approved_at": datetime.utcnow().isoformat(),
+        "batch_approval": True,
+    }
+    stmt = (
+        update(DocumentModel)
+        .where(DocumentModel.id.in_(document_ids), DocumentModel.status != "승인완료")
+        .values(status="승인완료", file_metadata=jsonb_patch(DocumentModel.file_metadata, patch))
+        .returning(DocumentModel)
+        .execution_options(populate_existing=True)
+    )
+    db.scalars(stmt).all()
+    approved_documents = [Document.model_validate(doc, from_attributes=True) for doc in documents]
 
     # 변경사항 저장
     db.commit()
+    cache_clear(ADMIN_STATS_CACHE)
+    cache_clear(SEARCH_CACHE)
 
-    # 변경된 문서 반환
-    approved_documents = [doc for doc in documents if doc.status == "승인완료"]
-
+    # 요청한 모든 문서 반환 (이미 승인되어 있던 문서 포함, 모두 승인완료 상태)
     return approved_documents
 
 
@@ -469,40 +481,39 @@ def reject_documents_batch(
     if not document_ids:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No document IDs provided")
 
-    # 해당 ID의 문서들 조회
-    documents = db.query(DocumentModel).filter(DocumentModel.id.in_(document_ids)).all()
-
-    # ID별 문서 매핑 생성 (빠른 접근을 위해)
-    doc_map = {str(doc.id): doc for doc in documents}
-
-    # 찾지 못한 문서 ID 확인
-    found_ids = [str(doc.id) for doc in documents]
-    missing_ids = [str(doc_id) for doc_id in document_ids if str(doc_id) not in found_ids]
+    # 찾지 못한 문서 ID 확인 (ID 컬럼만 조회)
+    existing_ids = set(db.scalars(select(DocumentModel.id).where(DocumentModel.id.in_(document_ids))))
+    missing_ids = [str(doc_id) for doc_id in document_ids if doc_id not in existing_ids]
 
     if missing_ids:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"Documents not found: {', '.join(missing_ids)}"
         )
 
-    # 모든 문서를 거부 상태로 변경
-    for document in documents:
-        # 문서 상태 변경
-        document.status = "승인대기"
-
-        # 거부 메타데이터 추가
-        metadata = document.file_metadata or {}
-        if reason:
-            metadata["reject_reason"] = reason
-        metadata["rejected_by"] = str(current_user.id)
-        metadata["rejected_at"] = datetime.utcnow().isoformat()
-        metadata["batch_rejection"] = True
-        document.file_metadata = metadata
+    # 한 번의 UPDATE로 거부 처리 (RETURNING으로 결과 조회)
+    patch = {
+        "rejected_by": str(current_user.id),
+        "rejected_at": datetime.utcnow().isoformat(),
+        "batch_rejection": True,
+    }
+    if reason:
+        patch["reject_reason"] = reason
+    stmt = (
+        update(DocumentModel)
+        .where(DocumentModel.id.in_(document_ids))
+        .values(status="승인대기", file_metadata=jsonb_patch(DocumentModel.file_metadata, patch))
+        .returning(DocumentModel)
+        .execution_options(populate_existing=True)
+    )
+    rejected_documents = [Document.model_validate(doc, from_attributes=True) for doc in db.scalars(stmt)]
 
     # 변경사항 저장
     db.commit()
+    cache_clear(ADMIN_STATS_CACHE)
+    cache_clear(SEARCH_CACHE)
 
     # 변경된 문서 반환
-    return documents
+    return rejected_documents
 
 
 # 문서 벡터화 API (관리자용)
@@ -521,7 +532,7 @@ def vectorize_document(
         full_vectorize: True인 경우 전체 파일 벡터화, False인 경우 요약만 벡터화 (기본값: False)
         force: True인 경우 유효기간 체크를 무시하고 강제로 벡터화 (기본값: False)
     """
-    document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
+    document = db.get(DocumentModel, document_id)
 
     if not document:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
@@ -565,37 +576,35 @@ def vectorize_document(
         )
 
     # 벡터화 작업 시작 전 메타데이터 업데이트
-    metadata = document.file_metadata or {}
-    metadata["vectorize_requested_by"] = str(current_user.id)
-    metadata["vectorize_requested_at"] = datetime.utcnow().isoformat()
-    metadata["full_vectorize"] = full_vectorize
-    metadata["force_vectorize"] = force
-    document.file_metadata = metadata
-
-    # 작업 상태 설정
-    document.vectorized = False  # 벡터화 작업이 완료될 때까지 False로 유지
+    # 작업 상태 설정 (벡터화 작업이 완료될 때까지 False로 유지)
+    patch = {
+        "vectorize_requested_by": str(current_user.id),
+        "vectorize_requested_at": datetime.utcnow().isoformat(),
+        "full_vectorize": full_vectorize,
+        "force_vectorize": force,
+    }
+    document = _patch_document(db, document_id, patch, vectorized=False)
 
     # 변경사항 저장
     db.commit()
-    db.refresh(document)
+    cache_clear(ADMIN_STATS_CACHE)
 
     # Celery 작업 시작
     try:
         task = vectorize_task.delay(str(document_id))
 
         # 작업 ID 저장
-        metadata = document.file_metadata or {}
-        metadata["vectorize_task_id"] = task.id
-        document.file_metadata = metadata
+        document = _patch_document(db, document_id, {"vectorize_task_id": task.id})
 
         db.commit()
     except Exception as e:
         logging.error(f"벡터화 작업 시작 중 오류 발생: {str(e)}")
         # 메타데이터에 오류 정보 저장
-        metadata = document.file_metadata or {}
-        metadata["vectorize_error"] = str(e)
-        metadata["vectorize_error_time"] = datetime.utcnow().isoformat()
-        document.file_metadata = metadata
+        _patch_document(
+            db,
+            document_id,
+            {"vectorize_error": str(e), "vectorize_error_time": datetime.utcnow().isoformat()},
+        )
 
         db.commit()
 
@@ -612,7 +621,7 @@ def delete_document_vector(
     document_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)
 ):
     """관리자용 - 문서의 벡터를 삭제합니다."""
-    document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
+    document = db.get(DocumentModel, document_id)
 
     if not document:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
@@ -629,9 +638,11 @@ def delete_document_vector(
         )
 
     # 작업 시작 전 메타데이터 업데이트
-    metadata = document.file_metadata or {}
-    metadata["vector_delete_requested_by"] = str(current_user.id)
-    metadata["vector_delete_requested_at"] = datetime.utcnow().isoformat()
+    patch = {
+        "vector_delete_requested_by": str(current_user.id),
+        "vector_delete_requested_at": datetime.utcnow().isoformat(),
+    }
+    document = _patch_document(db, document_id, patch)
 
     # 변경사항 저장
     db.commit()
@@ -641,16 +652,17 @@ def delete_document_vector(
         task = delete_vectors_task.delay(str(document_id))
 
         # 작업 ID 저장
-        metadata["vector_delete_task_id"] = task.id
-        document.file_metadata = metadata
+        document = _patch_document(db, document_id, {"vector_delete_task_id": task.id})
 
         db.commit()
     except Exception as e:
         logging.error(f"벡터 삭제 작업 시작 중 오류 발생: {str(e)}")
         # 메타데이터에 오류 정보 저장
-        metadata["vector_delete_error"] = str(e)
-        metadata["vector_delete_error_time"] = datetime.utcnow().isoformat()
-        document.file_metadata = metadata
+        _patch_document(
+            db,
+            document_id,
+            {"vector_delete_error": str(e), "vector_delete_error_time": datetime.utcnow().isoformat()},
+        )
 
         db.commit()
 
@@ -670,43 +682,43 @@ def check_documents_validity(
     """유효기간이 지난 문서의 벡터를 자동으로 삭제합니다."""
     today = datetime.utcnow().date()
 
-    # 유효기간이 지난 문서들 조회 (종료일이 지났거나 아직 시작되지 않은 문서)
-    expired_docs_query = (
-        db.query(DocumentModel)
-        .filter(DocumentModel.vectorized == True)
-        .filter(
-            # 종료일이 지난 문서
-            ((DocumentModel.end_date != None) & (DocumentModel.end_date < today))
-            |
-            # 시작일이 아직 오지 않은 문서
-            ((DocumentModel.start_date != None) & (DocumentModel.start_date > today))
-        )
+    # 유효기간이 지난 벡터화 문서 조건 (종료일이 지났거나 아직 시작되지 않은 문서)
+    expired_predicate = (DocumentModel.vectorized == True) & (
+        # 종료일이 지난 문서
+        ((DocumentModel.end_date != None) & (DocumentModel.end_date < today))
+        |
+        # 시작일이 아직 오지 않은 문서
+        ((DocumentModel.start_date != None) & (DocumentModel.start_date > today))
     )
 
-    expired_docs = expired_docs_query.all()
-
-    if not expired_docs:
-        return {"message": "No expired documents found with vectors", "processed_count": 0}
-
-    # 청크 삭제 및 벡터화 상태 업데이트
-    deleted_count = 0
-    for doc in expired_docs:
-        # 문서의 모든 청크 삭제
-        db.query(DocumentChunk).filter(DocumentChunk.document_id == doc.id).delete()
-
-        # 문서 벡터화 상태 업데이트
-        doc.vectorized = False
+    # 만료 문서의 모든 청크를 한 번에 삭제
+    db.execute(
+        delete(DocumentChunk)
+        .where(DocumentChunk.document_id.in_(select(DocumentModel.id).where(expired_predicate)))
+        .execution_options(synchronize_session=False)
+    )
 
-        # 메타데이터 업데이트
-        metadata = doc.file_metadata or {}
-        metadata["vector_deleted_by"] = str(current_user.id)
-        metadata["vector_deleted_at"] = datetime.utcnow().isoformat()
-        metadata["vector_deleted_reason"] = "Document expired or not yet valid"
-        doc.file_metadata = metadata
+    # 벡터화 상태 및 메타데이터를 한 번에 업데이트
+    patch = {
+        "vector_deleted_by": str(current_user.id),
+        "vector_deleted_at": datetime.utcnow().isoformat(),
+        "vector_deleted_reason": "Document expired or not yet valid",
+    }
+    result = db.execute(
+        update(DocumentModel)
+        .where(expired_predicate)
+        .values(vectorized=False, file_metadata=jsonb_patch(DocumentModel.file_metadata, patch))
+        .returning(DocumentModel.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_count = len(result.all())
 
-        deleted_count += 1
+    if not deleted_count:
+        db.rollback()
+        return {"message": "No expired documents found with vectors", "processed_count": 0}
 
     # 변경사항 저장
     db.commit()
+    cache_clear(ADMIN_STATS_CACHE)
 
     return {"message": f"Successfully processed {deleted_count} expired documents", "processed_count": deleted_count}
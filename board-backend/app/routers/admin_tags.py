@@ -1,41 +1,61 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_async_db
+from app.cache import acache_clear, acache_get, acache_set
 from app.auth import get_current_admin_user, get_current_active_user
 from app.models import Tag, UserTag, UserTagQuota, User
 from app.schemas import TagResponse, TagCreate, TagUpdate, UserTagQuotaUpdate, UserTagQuotaResponse, Message
 
-router = APIRouter(prefix="/admin/tags", tags=["admin-tags"])
+# 모든 엔드포인트에 관리자 권한 확인을 라우터 단위로 적용
+router = APIRouter(prefix="/admin/tags", tags=["admin-tags"], dependencies=[Depends(get_current_admin_user)])
+
+# 태그 목록 캐시 (사용자별 정보가 없는 전역 태그 목록만 캐시, 태그 생성/수정/삭제 시 무효화)
+ADMIN_TAGS_CACHE = "admin_tags"
+ADMIN_TAGS_CACHE_TTL = 120
+
+
+def _tag_list_cache_key(scope: str, skip: int, limit: int, search: Optional[str]) -> str:
+    return f"{scope}:{skip}:{limit}:{search or ''}"
+
+
+async def _cache_tag_list(key: str, tags: List[Tag]) -> List[dict]:
+    result = [TagResponse.model_validate(tag).model_dump(mode="json") for tag in tags]
+    await acache_set(ADMIN_TAGS_CACHE, key, result, ADMIN_TAGS_CACHE_TTL)
+    return result
 
 
 @router.get("/", response_model=List[TagResponse])
-def get_all_tags(
+async def get_all_tags(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """모든 태그 목록을 조회합니다."""
-    query = db.query(Tag)
+    cache_key = _tag_list_cache_key("all", skip, limit, search)
+    cached = await acache_get(ADMIN_TAGS_CACHE, cache_key)
+    if cached is not None:
+        return cached
+
+    query = select(Tag)
 
     # 검색어가 있는 경우
     if search:
         search_pattern = f"%{search.lower()}%"
-        query = query.filter(
+        query = query.where(
             func.lower(Tag.name).like(search_pattern) | func.lower(Tag.description).like(search_pattern)
         )
 
     # 정렬 및 페이지네이션
-    total = query.count()
-    tags = query.order_by(Tag.is_system.desc(), Tag.name).offset(skip).limit(limit).all()
+    tags = (await db.scalars(query.order_by(Tag.is_system.desc(), Tag.name).offset(skip).limit(limit))).all()
 
-    return tags
+    return await _cache_tag_list(cache_key, tags)
 
 
 @router.get("/system", response_model=List[TagResponse])
@@ -43,19 +63,22 @@ async def get_system_tags(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """시스템 태그 목록을 조회합니다."""
-    query = db.query(Tag).filter(Tag.is_system == True)
+    cache_key = _tag_list_cache_key("system", skip, limit, search)
+    cached = await acache_get(ADMIN_TAGS_CACHE, cache_key)
+    if cached is not None:
+        return cached
+
+    query = select(Tag).where(Tag.is_system == True)
 
     if search:
-        query = query.filter(Tag.name.ilike(f"%{search}%"))
+        query = query.where(Tag.name.ilike(f"%{search}%"))
 
-    total = query.count()
-    tags = query.offset(skip).limit(limit).all()
+    tags = (await db.scalars(query.offset(skip).limit(limit))).all()
 
-    return tags
+    return await _cache_tag_list(cache_key, tags)
 
 
 @router.get("/user", response_model=List[TagResponse])
@@ -63,19 +86,22 @@ async def get_user_tags(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """사용자 생성 태그 목록을 조회합니다."""
-    query = db.query(Tag).filter(Tag.is_system == False)
+    cache_key = _tag_list_cache_key("user", skip, limit, search)
+    cached = await acache_get(ADMIN_TAGS_CACHE, cache_key)
+    if cached is not None:
+        return cached
+
+    query = select(Tag).where(Tag.is_system == False)
 
     if search:
-        query = query.filter(Tag.name.ilike(f"%{search}%"))
+        query = query.where(Tag.name.ilike(f"%{search}%"))
 
-    total = query.count()
-    tags = query.offset(skip).limit(limit).all()
+    tags = (await db.scalars(query.offset(skip).limit(limit))).all()
 
-    return tags
+    return await _cache_tag_list(cache_key, tags)
 
 
 @router.post("/system", response_model=TagResponse)
@@ -91,7 +117,7 @@ async def create_system_tag(
     db_tag = Tag(name=tag.name, description=tag.description, is_system=True, created_by=current_user.id)
     db.add(db_tag)
     db.commit()
-    db.refresh(db_tag)
+    await acache_clear(ADMIN_TAGS_CACHE)
     return db_tag
 
 
@@ -100,11 +126,10 @@ async def update_system_tag(
     tag_id: UUID,
     tag_update: TagUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
 ):
     """시스템 태그를 수정합니다."""
-    db_tag = db.query(Tag).filter(Tag.id == tag_id, Tag.is_system == True).first()
-    if not db_tag:
+    db_tag = db.get(Tag, tag_id)
+    if not db_tag or not db_tag.is_system:
         raise HTTPException(status_code=404, detail="태그를 찾을 수 없습니다.")
 
     if tag_update.name and tag_update.name != db_tag.name:
@@ -118,31 +143,28 @@ async def update_system_tag(
         db_tag.description = tag_update.description
 
     db.commit()
-    db.refresh(db_tag)
+    await acache_clear(ADMIN_TAGS_CACHE)
     return db_tag
 
 
 @router.delete("/system/{tag_id}", response_model=Message)
-async def delete_system_tag(
-    tag_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)
-):
+async def delete_system_tag(tag_id: UUID, db: Session = Depends(get_db)):
     """시스템 태그를 삭제합니다."""
-    db_tag = db.query(Tag).filter(Tag.id == tag_id, Tag.is_system == True).first()
-    if not db_tag:
+    db_tag = db.get(Tag, tag_id)
+    if not db_tag or not db_tag.is_system:
         raise HTTPException(status_code=404, detail="태그를 찾을 수 없습니다.")
 
     # 연관된 사용자 태그도 함께 삭제
     db.query(UserTag).filter(UserTag.tag_id == tag_id).delete()
     db.delete(db_tag)
     db.commit()
+    await acache_clear(ADMIN_TAGS_CACHE)
 
     return {"message": "태그가 성공적으로 삭제되었습니다."}
 
 
 @router.get("/quota/{user_id}", response_model=UserTagQuotaResponse)
-async def get_user_tag_quota(
-    user_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)
-):
+async def get_user_tag_quota(user_id: UUID, db: Session = Depends(get_db)):
     """사용자의 태그 할당량을 조회합니다."""
     quota = db.query(UserTagQuota).filter(UserTagQuota.user_id == user_id).first()
     if not quota:
@@ -169,7 +191,6 @@ async def update_user_tag_quota(
         quota.updated_at = datetime.utcnow()
 
     db.commit()
-    db.refresh(quota)
     return quota
 
 
@@ -178,7 +199,6 @@ def get_all_user_tag_quotas(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
 ):
     """관리자용 - 모든 사용자의 태그 할당량을 조회합니다."""
     quotas = db.query(UserTagQuota).offset(skip).limit(limit).all()
@@ -1,10 +1,18 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 
-from app.database import get_db
-from app.auth import authenticate_user, create_access_token, get_password_hash, verify_password
+from app.database import get_db, get_async_db
+from app.auth import (
+    DUMMY_PASSWORD_HASH,
+    create_access_token,
+    get_password_hash,
+    get_user_by_email,
+    verify_password_async,
+)
 from app.config import settings
 from app.schemas import Token, UserCreate, User
 from app.models import User as UserModel
@@ -14,51 +22,48 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/signup", response_model=User)
 def signup(user: UserCreate, db: Session = Depends(get_db)):
-    # 사용자 이메일 중복 확인
-    db_user = db.query(UserModel).filter(UserModel.email == user.email).first()
-    if db_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-
     # 새 사용자 생성
     hashed_password = get_password_hash(user.password)
     db_user = UserModel(
         email=user.email, hashed_password=hashed_password, name=user.name, contact_email=user.contact_email
     )
 
-    # 데이터베이스에 저장
+    # 데이터베이스에 저장 (이메일 중복은 유니크 인덱스 위반으로 확인)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    # 사용자 인증
-    user = db.query(UserModel).filter(UserModel.email == form_data.username).first()
-    if not user:
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)
+):
+    # 사용자 인증 (비동기 세션으로 조회해 이벤트 루프를 막지 않음)
+    user = await get_user_by_email(db, form_data.username)
+
+    # 비밀번호 확인 (한 번만 검증, 사용자가 없어도 더미 해시로 같은 비용의 검증 수행)
+    hashed_password = user.hashed_password if user else DUMMY_PASSWORD_HASH
+    password_ok = await verify_password_async(form_data.password, hashed_password)
+
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # 비밀번호 확인
-    if not authenticate_user(db, form_data.username, form_data.password):
-        # 승인 여부 확인 (비밀번호가 일치하는 경우에만)
-        if verify_password(form_data.password, user.hashed_password) and not user.is_approved and user.role != "admin":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Your account is waiting for approval. Please contact administrator.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    # 승인 여부 확인 (관리자는 항상 로그인 가능, 비밀번호가 일치하는 경우에만 안내)
+    if user.role != "admin" and not user.is_approved:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Your account is waiting for approval. Please contact administrator.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     # 토큰 만료 시간
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -1,20 +1,47 @@
 import os
 import json
-from typing import List, Optional, Dict
+import shutil
+import orjson
+from functools import lru_cache
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Body, Query
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, desc, asc, func
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    UploadFile,
+    File,
+    Form,
+    Request,
+    Body,
+    Query,
+    Response,
+    Header,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import select, update, desc, asc, func
 from uuid import UUID
 import logging
-from fastapi.responses import StreamingResponse, RedirectResponse
+from fastapi.responses import StreamingResponse, RedirectResponse, ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile as StarletteUploadFile
 from pydantic import BaseModel
+from minio.error import S3Error
 import uuid
 import urllib.parse
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db, get_async_db
 from app.auth import get_current_active_user, get_current_admin_user
-from app.storage import upload_multiple_files, get_multiple_download_urls, delete_multiple_files
+from app.storage import (
+    upload_multiple_files,
+    get_multiple_download_urls,
+    delete_multiple_files,
+    RangeNotSatisfiableError,
+    STREAM_CHUNK_SIZE,
+)
 from app.schemas import (
     Document,
     DocumentCreate,
@@ -24,11 +51,15 @@ from app.schemas import (
     SupportedFileType,
     DocumentUpdate,
 )
-from app.models import Document as DocumentModel, User, DocumentFile, DocumentChunk
+from app.models import Document as DocumentModel, User, DocumentFile, DocumentChunk, document_child_deletes
 from app.config import settings
+from app.cache import acache_clear, cache_clear
+from app.routers.search import SEARCH_CACHE
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+logger = logging.getLogger(__name__)
+
 # 지원되는 파일 형식 정의
 SUPPORTED_FILE_TYPES = [
     SupportedFileType(extension=".pdf", description="PDF 문서", max_size_mb=50),
@@ -46,8 +77,142 @@ SUPPORTED_FILE_TYPES = [
     SupportedFileType(extension=".md", description="Markdown 파일", max_size_mb=10),
 ]
 
-# 허용되는 파일 확장자 목록
-ALLOWED_EXTENSIONS = [file_type.extension for file_type in SUPPORTED_FILE_TYPES]
+# 허용되는 파일 확장자 집합 (오류 메시지용 문자열은 정의 순서대로 미리 생성)
+ALLOWED_EXTENSIONS = frozenset(file_type.extension for file_type in SUPPORTED_FILE_TYPES)
+ALLOWED_EXTENSIONS_TEXT = ", ".join(file_type.extension for file_type in SUPPORTED_FILE_TYPES)
+
+
+# 엔드포인트별 문서 조회 쿼리 (로더 옵션 체인을 요청마다 만들지 않도록 모듈 로드 시 한 번만 구성)
+# - 목록: 응답에 쓰는 파일/업로더 컬럼만 로드하고, 그 밖의 관계 지연 로딩은 오류로 차단
+_DOCUMENT_LIST_QUERY = select(DocumentModel).options(
+    selectinload(DocumentModel.files).load_only(
+        DocumentFile.original_filename, DocumentFile.file_path, DocumentFile.file_type
+    ),
+    selectinload(DocumentModel.user).load_only(User.name, User.email),
+    raiseload("*"),
+)
+# - 상세: 파일/업로더 전체
+_DOCUMENT_DETAIL_QUERY = select(DocumentModel).options(
+    selectinload(DocumentModel.files), selectinload(DocumentModel.user)
+)
+# - 다운로드 URL 생성: 파일 경로/이름/처리 상태만
+_DOCUMENT_DOWNLOAD_QUERY = select(DocumentModel).options(
+    selectinload(DocumentModel.files).load_only(
+        DocumentFile.file_path,
+        DocumentFile.original_filename,
+        DocumentFile.processing_status,
+        DocumentFile.file_metadata,
+    )
+)
+# - 개별 파일 다운로드: 위 항목 + 컨텐츠 타입
+_DOCUMENT_FILE_DOWNLOAD_QUERY = select(DocumentModel).options(
+    selectinload(DocumentModel.files).load_only(
+        DocumentFile.file_path,
+        DocumentFile.original_filename,
+        DocumentFile.content_type,
+        DocumentFile.processing_status,
+        DocumentFile.file_metadata,
+    )
+)
+
+# 문서 목록 정렬에 허용하는 컬럼
+_SORT_COLUMNS = {
+    "created_at": DocumentModel.created_at,
+    "updated_at": DocumentModel.updated_at,
+    "title": DocumentModel.title,
+    "view_count": DocumentModel.view_count,
+    "download_count": DocumentModel.download_count,
+}
+
+# NDJSON 스트리밍 시 DB에서 한 번에 읽어올 행 수
+STREAM_BATCH_SIZE = 100
+
+# 지원 파일 형식 응답은 변하지 않으므로 직렬화된 JSON을 미리 만들어 둠
+_SUPPORTED_TYPES_JSON = SupportedFileTypes(file_types=SUPPORTED_FILE_TYPES).model_dump_json().encode()
+
+
+def _file_extension(filename: Optional[str]) -> str:
+    """파일명에서 소문자 확장자(.pdf 등)를 추출 (os.path.splitext와 같이 숨김 파일의 선행 점은 무시)"""
+    name = filename or ""
+    dot = name.rfind(".")
+    return name[dot:].lower() if dot > 0 else ""
+
+
+async def _increment_counter(db: AsyncSession, document_id: UUID, column: str):
+    """문서의 조회수/다운로드 수를 원자적 UPDATE로 1 증가시키고 (증가된 값, updated_at)을 반환"""
+    # SELECT 후 값을 더해 쓰는 방식은 동시 요청 시 증가분이 유실되므로 DB에서 직접 증가
+    counter = getattr(DocumentModel, column)
+    result = await db.execute(
+        update(DocumentModel)
+        .where(DocumentModel.id == document_id)
+        .values({counter: counter + 1})
+        .returning(counter, DocumentModel.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    await db.commit()
+    return row
+
+
+@lru_cache(maxsize=1024)
+def _parse_tags(raw: str) -> Tuple[str, ...]:
+    """폼으로 전달된 태그 문자열(JSON 배열 또는 쉼표 구분)을 파싱 (같은 UI 상태에서 반복되는 입력은 캐시에서 반환)"""
+    if not raw:
+        return ()
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError:
+        parsed = raw
+    # 문자열 배열은 그대로 사용, null/객체/문자열이 아닌 값이 섞인 배열은 태그 없음
+    # 그 외(문자열, "2024"처럼 숫자로 해석된 값)는 쉼표로 분리
+    if isinstance(parsed, list):
+        return tuple(parsed) if all(isinstance(tag, str) for tag in parsed) else ()
+    if parsed is None or isinstance(parsed, dict):
+        return ()
+    raw_tags = parsed if isinstance(parsed, str) else raw
+    return tuple(tag.strip() for tag in raw_tags.split(","))
+
+
+def _parse_iso(value: str) -> datetime:
+    """ISO 8601 날짜 문자열(YYYY-MM-DD, YYYY-MM-DDTHH:MM:SS[Z|±HH:MM])을 datetime으로 변환"""
+    # Python 3.9의 fromisoformat은 "Z" 접미사를 지원하지 않으므로 UTC 오프셋으로 바꿔서 파싱
+    normalized = value[:-1] + "+00:00" if value.endswith("Z") else value
+    try:
+        return datetime.fromisoformat(normalized)
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%d")
+
+
+# Content-Disposition 헤더에 그대로 넣을 수 있는 문자 (출력 가능한 ASCII 중 따옴표/역슬래시 제외)
+_HEADER_SAFE_FILENAME_CHARS = frozenset(chr(c) for c in range(0x20, 0x7F)) - frozenset('"\\')
+
+
+def _content_disposition(file_name: str) -> str:
+    """다운로드용 Content-Disposition 헤더 값 생성 (ASCII 파일명은 인코딩 없이 그대로 사용)"""
+    if _HEADER_SAFE_FILENAME_CHARS.issuperset(file_name):
+        return f'attachment; filename="{file_name}"'
+    # 한글 등 특수문자는 퍼센트 인코딩하고, RFC 5987 filename* 파라미터도 함께 제공
+    encoded_filename = urllib.parse.quote(file_name)
+    return f"attachment; filename=\"{encoded_filename}\"; filename*=UTF-8''{encoded_filename}"
+
+
+def _range_headers(byte_range: Optional[Tuple[int, int]], size: int) -> Dict[str, str]:
+    """다운로드 응답의 길이/Range 관련 헤더 생성 (항상 Accept-Ranges를 알려 이어받기 요청을 허용)"""
+    if not byte_range:
+        return {"Accept-Ranges": "bytes", "Content-Length": str(size)}
+    start, end = byte_range
+    return {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "Content-Range": f"bytes {start}-{end}/{size}",
+    }
+
+
+def _save_upload_file(upload_file: UploadFile, path: str) -> None:
+    """업로드 파일(스풀된 임시 파일)을 지정한 경로로 청크 단위 복사"""
+    upload_file.file.seek(0)
+    with open(path, "wb") as buffer:
+        shutil.copyfileobj(upload_file.file, buffer, STREAM_CHUNK_SIZE)
 
 
 # 문서 업로드 응답 모델 (Celery 작업 ID 포함)
@@ -77,7 +242,8 @@ class DocumentUploadResponse(BaseModel):
 @router.get("/supported-types", response_model=SupportedFileTypes)
 def get_supported_file_types():
     """지원되는 파일 형식 목록을 반환합니다."""
-    return SupportedFileTypes(file_types=SUPPORTED_FILE_TYPES)
+    # Response를 직접 반환하면 response_model 검증/직렬화를 건너뜀 (response_model은 문서화용)
+    return Response(content=_SUPPORTED_TYPES_JSON, media_type="application/json")
 
 
 # 멀티파일 문서 업로드 API
@@ -101,76 +267,28 @@ async def create_document(
     비동기 처리 옵션을 사용하면 파일 업로드와 처리가 백그라운드에서 진행됩니다.
     작업 ID가 응답에 포함되어 작업 진행 상황을 조회할 수 있습니다.
     """
-    # 폼 데이터에서 파일 추출 (모든 UploadFile 타입 찾기)
-    upload_files = []
+    # 폼 데이터에서 파일 추출 (필드 이름과 관계없이 모든 UploadFile을 한 번에 수집, filename 기준 중복 제거)
+    # (폼 파싱 결과는 starlette UploadFile이므로 fastapi UploadFile로는 isinstance 검사가 통과하지 않음)
     form = await request.form()
-
-    # 디버깅 정보 출력
-    print(f"Form keys: {form.keys()}")
-    print(f"명시적 파일 파라미터: {files}")
-
-    # 명시적 파일 파라미터 처리
-    if files:
-        print(f"명시적 파일 추가: {files[0].filename}")
-        upload_files.extend(files)
-
-    # 파일 추출 방법 개선: 다양한 파일 필드 이름 처리
-    for key in form.keys():
-        value = form[key]
-        print(f"Key: {key}, Type: {type(value)}")
-        if isinstance(value, UploadFile):
-            print(f"Found file from form: {value.filename}")
-            upload_files.append(value)
-
-    # 일괄 처리된 'files' 필드 처리 (멀티파일 필드)
-    if "files" in form:
-        files_value = form["files"]
-        # 단일 파일인 경우
-        if isinstance(files_value, UploadFile):
-            print(f"Found single file in 'files' field: {files_value.filename}")
-            upload_files.append(files_value)
-        # 다중 파일인 경우
-        elif isinstance(files_value, list):
-            print(f"Found files array with {len(files_value)} items")
-            for file in files_value:
-                if isinstance(file, UploadFile):
-                    print(f"Found file in array: {file.filename}")
-                    upload_files.append(file)
-
-    # file로 시작하는 인덱스 처리 (file0, file1, ...)
-    file_keys = [key for key in form.keys() if key.startswith("file") and key != "files"]
-    for key in file_keys:
-        value = form[key]
-        if isinstance(value, UploadFile):
-            print(f"Found indexed file {key}: {value.filename}")
-            upload_files.append(value)
-
-    # 중복 파일 제거 (filename 기준)
-    seen_filenames = set()
-    unique_files = []
-    for file in upload_files:
-        if file.filename not in seen_filenames:
-            seen_filenames.add(file.filename)
-            unique_files.append(file)
-
-    upload_files = unique_files
-    print(f"총 업로드할 파일 수: {len(upload_files)}")
+    seen_files = {}
+    for _, value in form.multi_items():
+        if isinstance(value, StarletteUploadFile) and value.filename not in seen_files:
+            seen_files[value.filename] = value
+    for file in files or []:
+        seen_files.setdefault(file.filename, file)
+    upload_files = list(seen_files.values())
 
     # 파일이 있는 경우에만 파일 타입 검증
     if upload_files:
         for file in upload_files:
-            file_extension = os.path.splitext(file.filename)[1].lower()
-            if file_extension not in ALLOWED_EXTENSIONS:
+            if _file_extension(file.filename) not in ALLOWED_EXTENSIONS:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File type not allowed for file '{file.filename}'. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}",
+                    detail=f"File type not allowed for file '{file.filename}'. Allowed types: {ALLOWED_EXTENSIONS_TEXT}",
                 )
 
-    # 태그 처리 (JSON 문자열에서 Python 리스트로 변환)
-    try:
-        tag_list = json.loads(tags) if tags else []
-    except json.JSONDecodeError:
-        tag_list = [tag.strip() for tag in tags.split(",")] if tags else []
+    # 태그 처리 (JSON 문자열에서 Python 리스트로 변환, 캐시는 튜플로 보관하므로 호출부에서 리스트로 복사)
+    tag_list = list(_parse_tags(tags))
 
     # 날짜 처리
     doc_start_date = None
@@ -178,16 +296,9 @@ async def create_document(
 
     if startDate:  # startDate 파라미터 사용
         try:
-            # Z 또는 timezone 정보가 있으면 처리, 없으면 기본 형식 사용
-            if "Z" in startDate:
-                doc_start_date = datetime.fromisoformat(startDate.replace("Z", "+00:00"))
-            elif "T" in startDate:
-                doc_start_date = datetime.fromisoformat(startDate)
-            else:
-                # 날짜만 있는 경우 (YYYY-MM-DD)
-                doc_start_date = datetime.strptime(startDate, "%Y-%m-%d")
+            doc_start_date = _parse_iso(startDate)
         except ValueError as e:
-            print(f"시작일 파싱 오류: {e}, 입력값: {startDate}")
+            logger.warning(f"시작일 파싱 오류: {e}, 입력값: {startDate}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid startDate format: {startDate}. Use ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
@@ -195,21 +306,18 @@ async def create_document(
 
     if endDate:  # endDate 파라미터 사용
         try:
-            # Z 또는 timezone 정보가 있으면 처리, 없으면 기본 형식 사용
-            if "Z" in endDate:
-                doc_end_date = datetime.fromisoformat(endDate.replace("Z", "+00:00"))
-            elif "T" in endDate:
-                doc_end_date = datetime.fromisoformat(endDate)
-            else:
-                # 날짜만 있는 경우 (YYYY-MM-DD)
-                doc_end_date = datetime.strptime(endDate, "%Y-%m-%d")
+            doc_end_date = _parse_iso(endDate)
         except ValueError as e:
-            print(f"종료일 파싱 오류: {e}, 입력값: {endDate}")
+            logger.warning(f"종료일 파싱 오류: {e}, 입력값: {endDate}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid endDate format: {endDate}. Use ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
             )
 
+    # 비동기 업로드의 대표 작업 ID(첫 번째 파일의 작업 ID)를 미리 발급해 문서 생성 시 함께 저장
+    # (업로드 후 작업 ID를 기록하기 위한 두 번째 커밋이 필요 없음)
+    main_task_id = str(uuid.uuid4()) if async_processing and upload_files else None
+
     try:
         # 트랜잭션 시작 - 중요: 문서 생성 및 커밋 먼저 수행
         # 문서 객체 생성 (파일 정보 없이)
@@ -221,6 +329,7 @@ async def create_document(
             start_date=doc_start_date,
             end_date=doc_end_date,
             is_public=is_public,  # 공개/비공개 상태 추가
+            file_metadata={"main_task_id": main_task_id} if main_task_id else None,
         )
 
         # 데이터베이스에 저장하고 즉시 커밋 - 파일 업로드 전에 문서 ID 확보
@@ -228,33 +337,12 @@ async def create_document(
         db.commit()
         db.refresh(db_document)
 
-        # 문서 ID 확보 후 파일 업로드 진행
-        print(f"Document created with ID: {db_document.id}")
-
-        # 다중 파일 업로드 (비동기 처리 옵션 전달)
-        print(f"upload_files: {upload_files}")
+        # 문서 ID 확보 후 파일 업로드 진행 (비동기 처리 옵션 전달)
+        # (첫 번째 파일의 업로드 작업은 미리 발급한 대표 작업 ID로 등록됨, 파일 정보 DB 저장은 storage.py에서 처리)
         file_infos = await upload_multiple_files(
-            upload_files, str(current_user.id), str(db_document.id), async_processing
+            upload_files, str(current_user.id), str(db_document.id), async_processing, first_task_id=main_task_id
         )
 
-        # 파일 정보 DB 저장 (storage.py 내에서 이미 처리됨)
-        # 작업 ID 추적을 위한 변수
-        main_task_id = None
-        print(f"file_infos: {file_infos}")
-
-        # 작업 ID 추출
-        for file_info in file_infos:
-            # 작업 ID 저장 (첫 번째 파일의 작업 ID를 대표 작업 ID로 사용)
-            if async_processing and "task_id" in file_info and not main_task_id:
-                main_task_id = file_info["task_id"]
-
-        # 문서에 작업 ID 저장 (필요한 경우)
-        if main_task_id:
-            file_metadata = db_document.file_metadata or {}
-            file_metadata["main_task_id"] = main_task_id
-            db_document.file_metadata = file_metadata
-            db.commit()
-
         # 응답 준비 (Celery 작업 ID 포함)
         response = {
             "id": db_document.id,
@@ -284,129 +372,153 @@ async def create_document(
     except Exception as e:
         # 오류 발생 시 롤백
         db.rollback()
-        print(f"문서 생성 중 오류 발생: {str(e)}")
+        logger.error(f"문서 생성 중 오류 발생: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to create document: {str(e)}"
         )
 
 
-# 문서 목록 조회 API
-@router.get("", response_model=List[Document])
-def get_documents(
-    skip: int = 0,
-    limit: int = 100,
-    sort_by: str = "created_at",
-    sort_order: str = "desc",
-    status: Optional[str] = None,
-    tag: Optional[List[str]] = Query(None),
-    view_type: str = "all",  # 'all', 'my', 'public' 옵션 추가
-    uploader_id: Optional[UUID] = None,  # 특정 업로더의 문서만 조회
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+def _document_list_statement(
+    current_user: User,
+    sort_by: str,
+    sort_order: str,
+    doc_status: Optional[str],
+    tag: Optional[List[str]],
+    view_type: str,
+    uploader_id: Optional[UUID],
 ):
-    """
-    문서 목록을 조회합니다.
-
-    - view_type:
-      - 'all': 모든 문서 (관리자만 가능)
-      - 'my': 내가 올린 문서
-      - 'public': 공개된 문서
-    """
-    # 기본 쿼리 구성
-    query = db.query(DocumentModel).options(selectinload(DocumentModel.files), selectinload(DocumentModel.user))
+    """문서 목록 조회 쿼리를 구성 (목록 API와 NDJSON 스트리밍 API에서 공통 사용)"""
+    stmt = _DOCUMENT_LIST_QUERY
 
     # 1. 보기 유형에 따른 필터링
     if view_type == "my":
         # 내가 올린 문서만 조회
-        query = query.filter(DocumentModel.user_id == current_user.id)
+        stmt = stmt.where(DocumentModel.user_id == current_user.id)
     elif view_type == "public":
         # 공개 문서만 조회 (승인된 문서 중)
-        query = query.filter(DocumentModel.is_public == True, DocumentModel.status == "승인완료")
+        stmt = stmt.where(DocumentModel.is_public == True, DocumentModel.status == "승인완료")
     elif view_type == "all":
         # 관리자가 아니면 전체 조회 불가능
         if current_user.role != "admin":
             # 일반 사용자는 자신의 문서 + 공개된 문서만 볼 수 있음
-            query = query.filter(
+            stmt = stmt.where(
                 (DocumentModel.user_id == current_user.id)
                 | ((DocumentModel.is_public == True) & (DocumentModel.status == "승인완료"))
             )
 
     # 2. 특정 업로더의 문서만 조회 (관리자 기능)
     if uploader_id and current_user.role == "admin":
-        query = query.filter(DocumentModel.user_id == uploader_id)
+        stmt = stmt.where(DocumentModel.user_id == uploader_id)
 
     # 3. 상태 필터링
-    if status:
-        query = query.filter(DocumentModel.status == status)
+    if doc_status:
+        stmt = stmt.where(DocumentModel.status == doc_status)
 
-    # 4. 태그 필터링
+    # 4. 태그 필터링 (모든 태그를 포함하는 문서를 tags @> ARRAY[...] 한 번으로 조회, GIN 인덱스 사용)
     if tag:
-        for t in tag:
-            query = query.filter(DocumentModel.tags.any(t))
+        stmt = stmt.where(DocumentModel.tags.contains(tag))
 
     # 5. 정렬 설정
-    if sort_order.lower() == "asc":
-        order_func = getattr(getattr(DocumentModel, sort_by), "asc")
-    else:
-        order_func = getattr(getattr(DocumentModel, sort_by), "desc")
+    # 허용되지 않은 정렬 기준은 생성일시로 대체
+    sort_column = _SORT_COLUMNS.get(sort_by, DocumentModel.created_at)
+    return stmt.order_by(sort_column.asc() if sort_order.lower() == "asc" else sort_column.desc())
+
+
+def _document_list_item(doc: DocumentModel) -> dict:
+    """목록 응답용 문서 dict 생성 (파일 정보는 리스트 컴프리헨션으로 바로 채움)"""
+    return {
+        "id": doc.id,
+        "title": doc.title,
+        "summary": doc.summary,
+        "tags": doc.tags,
+        "status": doc.status,
+        "created_at": doc.created_at,
+        "updated_at": doc.updated_at,
+        "user_id": doc.user_id,
+        "start_date": doc.start_date,
+        "end_date": doc.end_date,
+        "view_count": doc.view_count,
+        "download_count": doc.download_count,
+        "vectorized": doc.vectorized,
+        "file_metadata": doc.file_metadata,
+        "is_public": doc.is_public,
+        "uploader_name": doc.user.name if doc.user else None,
+        "uploader_email": doc.user.email if doc.user else None,
+        "file_names": [file.original_filename for file in doc.files],
+        "file_paths": [file.file_path for file in doc.files],
+        "file_types": [file.file_type for file in doc.files],
+    }
+
+
+# 문서 목록 조회 API
+@router.get("", response_model=List[Document])
+def get_documents(
+    skip: int = 0,
+    limit: int = 100,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    status: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None),
+    view_type: str = "all",  # 'all', 'my', 'public' 옵션 추가
+    uploader_id: Optional[UUID] = None,  # 특정 업로더의 문서만 조회
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    문서 목록을 조회합니다.
+
+    - view_type:
+      - 'all': 모든 문서 (관리자만 가능)
+      - 'my': 내가 올린 문서
+      - 'public': 공개된 문서
+    """
+    stmt = _document_list_statement(current_user, sort_by, sort_order, status, tag, view_type, uploader_id)
 
     # 정렬 및 페이지네이션 적용
-    documents = query.order_by(order_func()).offset(skip).limit(limit).all()
-
-    # 응답 구성
-    result = []
-    for doc in documents:
-        doc_dict = {
-            "id": doc.id,
-            "title": doc.title,
-            "summary": doc.summary,
-            "tags": doc.tags,
-            "status": doc.status,
-            "created_at": doc.created_at,
-            "updated_at": doc.updated_at,
-            "user_id": doc.user_id,
-            "start_date": doc.start_date,
-            "end_date": doc.end_date,
-            "view_count": doc.view_count,
-            "download_count": doc.download_count,
-            "vectorized": doc.vectorized,
-            "file_metadata": doc.file_metadata,
-            "is_public": doc.is_public,
-            "uploader_name": doc.user.name if doc.user else None,
-            "uploader_email": doc.user.email if doc.user else None,
-        }
+    documents = db.execute(stmt.offset(skip).limit(limit)).scalars().all()
 
-        # 파일 정보 추가
-        file_names = []
-        file_paths = []
-        file_types = []
+    # DB에서 읽은 값이므로 response_model 재검증 없이 orjson으로 바로 직렬화 (response_model은 문서화용)
+    return ORJSONResponse([_document_list_item(doc) for doc in documents])
 
-        if doc.files:
-            for file in doc.files:
-                file_names.append(file.original_filename)
-                file_paths.append(file.file_path)
-                file_types.append(file.file_type)
 
-        doc_dict["file_names"] = file_names
-        doc_dict["file_paths"] = file_paths
-        doc_dict["file_types"] = file_types
+# 문서 목록 NDJSON 스트리밍 API (/{document_id} 경로보다 먼저 등록해야 함)
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_documents(
+    skip: int = 0,
+    limit: int = 1000,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    status: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None),
+    view_type: str = "all",
+    uploader_id: Optional[UUID] = None,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    문서 목록을 NDJSON(한 줄에 문서 하나)으로 스트리밍합니다.
+    조회 조건은 목록 조회 API와 같으며, 큰 페이지도 행을 읽는 대로 전송합니다.
+    """
+    stmt = _document_list_statement(current_user, sort_by, sort_order, status, tag, view_type, uploader_id)
+    stmt = stmt.offset(skip).limit(limit).execution_options(yield_per=STREAM_BATCH_SIZE)
 
-        result.append(doc_dict)
+    async def generate():
+        # 의존성 세션은 응답 전송 전에 닫히므로 스트리밍 동안 사용할 세션을 직접 엶
+        async with AsyncSessionLocal() as db:
+            # 서버 측 커서로 yield_per 단위씩 읽어 전체 결과를 메모리에 쌓지 않음
+            result = await db.stream(stmt)
+            async for doc in result.scalars():
+                yield orjson.dumps(_document_list_item(doc)) + b"\n"
 
-    return result
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 # 문서 상세 조회 API
 @router.get("/{document_id}", response_model=DocumentDetail)
-def get_document(
-    document_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+async def get_document(
+    document_id: UUID, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_active_user)
 ):
-    document = (
-        db.query(DocumentModel)
-        .options(selectinload(DocumentModel.files), selectinload(DocumentModel.user))
-        .filter(DocumentModel.id == document_id)
-        .first()
-    )
+    result = await db.execute(_DOCUMENT_DETAIL_QUERY.where(DocumentModel.id == document_id))
+    document = result.scalar_one_or_none()
 
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -417,24 +529,11 @@ def get_document(
         if not (document.is_public and document.status == "승인완료"):
             raise HTTPException(status_code=403, detail="You don't have permission to access this document")
 
-    # 조회수 증가
-    document.view_count += 1
-    db.commit()
-
-    # 파일 정보 추가
-    file_names = []
-    file_paths = []
-    file_types = []
-
-    if document.files:
-        for file in document.files:
-            file_names.append(file.original_filename)
-            file_paths.append(file.file_path)
-            file_types.append(file.file_type)
-
-    document.file_names = file_names
-    document.file_paths = file_paths
-    document.file_types = file_types
+    # 조회수 증가 (로드된 객체에는 변경 표시 없이 증가된 값만 반영)
+    row = await _increment_counter(db, document_id, "view_count")
+    if row:
+        set_committed_value(document, "view_count", row[0])
+        set_committed_value(document, "updated_at", row[1])
 
     return document
 
@@ -453,13 +552,13 @@ def create_document(
 
 # 문서 수정 API
 @router.put("/{document_id}", response_model=Document)
-def update_document(
+async def update_document(
     document_id: UUID,
     document_update: DocumentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    db_document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
+    db_document = await db.get(DocumentModel, document_id)
 
     if not db_document:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -470,26 +569,25 @@ def update_document(
 
     # 업데이트할 필드 유효성 검사
     update_data = document_update.dict(exclude_unset=True)
-    print(f"update_data: {update_data}")
     # 일반 사용자가 수정하면 승인대기 상태로 변경 (관리자는 상태 유지)
     if current_user.role != "admin" and "status" not in update_data:
         update_data["status"] = "승인대기"
 
-    # 필드 업데이트
+    # 필드 업데이트 (updated_at은 eager_defaults로 UPDATE ... RETURNING 시 함께 갱신되므로 refresh 불필요)
     for key, value in update_data.items():
         setattr(db_document, key, value)
 
-    db.commit()
-    db.refresh(db_document)
+    await db.commit()
+    await acache_clear(SEARCH_CACHE)
     return db_document
 
 
 # 문서 삭제 API
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_document(
-    document_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+async def delete_document(
+    document_id: UUID, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_active_user)
 ):
-    db_document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
+    db_document = await db.get(DocumentModel, document_id)
 
     if not db_document:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -501,19 +599,22 @@ def delete_document(
     # 문서 관련 파일 및 벡터 데이터 삭제 로직 (파일 시스템 또는 MinIO에서 삭제)
     # TODO: 연결된 파일 정리 로직 구현
 
-    # DB에서 문서 삭제
-    db.delete(db_document)
-    db.commit()
+    # 청크/파일 레코드를 먼저 삭제한 뒤 문서 삭제 (기존 DB의 외래 키에는 CASCADE가 없으므로 명시적으로 삭제)
+    for statement in document_child_deletes(document_id):
+        await db.execute(statement)
+    await db.delete(db_document)
+    await db.commit()
+    await acache_clear(SEARCH_CACHE)
 
     return {"message": "Document deleted successfully"}
 
 
 # 공개 상태 변경 API
 @router.post("/{document_id}/toggle-public", response_model=Document)
-def toggle_public_status(
-    document_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+async def toggle_public_status(
+    document_id: UUID, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_active_user)
 ):
-    db_document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
+    db_document = await db.get(DocumentModel, document_id)
 
     if not db_document:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -535,32 +636,21 @@ def toggle_public_status(
         if db_document.status != "승인완료":
             db_document.status = "승인대기"
 
-    db.commit()
-    db.refresh(db_document)
+    await db.commit()
+    await acache_clear(SEARCH_CACHE)
     return db_document
 
 
 # 문서 다운로드 URL 생성 API
 @router.get("/{document_id}/download")
-def download_document(
-    document_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+async def download_document(
+    document_id: UUID, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_active_user)
 ):
     """특정 문서에 속한 파일들의 다운로드 URL을 생성합니다."""
     try:
         # 문서와 파일을 함께 조회 (필요한 필드만 로드)
-        document = (
-            db.query(DocumentModel)
-            .options(
-                selectinload(DocumentModel.files).load_only(
-                    DocumentFile.file_path,
-                    DocumentFile.original_filename,
-                    DocumentFile.processing_status,  # 처리 상태 추가
-                    DocumentFile.file_metadata,  # 메타데이터 추가
-                )
-            )
-            .filter(DocumentModel.id == document_id)
-            .first()
-        )
+        result = await db.execute(_DOCUMENT_DOWNLOAD_QUERY.where(DocumentModel.id == document_id))
+        document = result.scalar_one_or_none()
 
         if not document:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
@@ -607,24 +697,24 @@ def download_document(
 
         # 다운로드 URL 생성 (완료된 파일만)
         file_paths = [file.file_path for file in available_files]
-        file_names = [file.original_filename for file in available_files]
+        file_names = {file.file_path: file.original_filename for file in available_files}
 
         try:
-            # 다운로드 URL 생성
-            download_urls_result = get_multiple_download_urls(file_paths)
+            # 다운로드 URL 생성 (MinIO 클라이언트는 동기 방식이므로 스레드풀에서 실행)
+            download_urls_result = await run_in_threadpool(get_multiple_download_urls, file_paths)
 
             # 다운로드 URL과 파일명 함께 반환
             download_info = []
             download_urls = []
 
-            for i, url_info in enumerate(download_urls_result):
-                if url_info and "url" in url_info:  # URL 생성에 실패한 경우는 건너뜀
+            # URL 생성에 실패한 파일은 결과에서 빠지므로 인덱스가 아닌 경로로 파일명을 찾음
+            for url_info in download_urls_result:
+                if url_info and "url" in url_info:
                     download_urls.append(url_info["url"])
-                    download_info.append({"filename": file_names[i], "url": url_info["url"]})
+                    download_info.append({"filename": file_names[url_info["path"]], "url": url_info["url"]})
 
             # 다운로드 횟수 증가
-            document.download_count += 1
-            db.commit()
+            await _increment_counter(db, document_id, "download_count")
 
             # 사용할 수 없는 파일이 있는 경우 경고 추가
             if unavailable_files:
@@ -656,7 +746,7 @@ async def direct_download_handler(
     file_name: str,
     content_type: str,
     document_id: UUID,
-    db: Session,
+    db: AsyncSession,
 ):
     """
     MinIO에서 파일을 직접 스트리밍하여 다운로드 제공
@@ -667,26 +757,21 @@ async def direct_download_handler(
         from app.models import Document as DocumentModel
 
         # 문서 다운로드 횟수 증가
-        document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
-        if document:
-            document.download_count += 1
-            db.commit()
+        await _increment_counter(db, document_id, "download_count")
 
         # 파일 스트림 가져오기
-        stream, size, actual_content_type = get_file_stream(file_path)
+        stream, size, actual_content_type, _ = await run_in_threadpool(get_file_stream, file_path)
 
         # 실제 컨텐츠 타입이 없으면 전달된 것 사용
         if not actual_content_type or actual_content_type == "application/octet-stream":
             actual_content_type = content_type or "application/octet-stream"
 
-        # 파일명 인코딩 처리 (한글 등 특수문자 지원)
-        encoded_filename = urllib.parse.quote(file_name)
 
         # 응답 헤더 설정
         headers = {
-            "Content-Disposition": f'attachment; filename="{encoded_filename}"',
+            "Content-Disposition": _content_disposition(file_name),
             "Content-Type": actual_content_type,
-            "Content-Length": str(size),
+            **_range_headers(None, size),
         }
 
         # 스트리밍 응답 생성
@@ -703,26 +788,15 @@ async def download_document_file(
     file_name: str,
     direct: bool = Query(True, description="직접 스트리밍 방식 사용 여부 (기본값: True)"),
     chunk_size: int = Query(4 * 1024 * 1024, description="청크 크기 (바이트)"),
-    db: Session = Depends(get_db),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """특정 문서에서 지정된 파일을 직접 다운로드합니다."""
+    """특정 문서에서 지정된 파일을 직접 다운로드합니다. (Range 요청 시 부분 전송)"""
     try:
         # 문서와 파일을 함께 조회 (필요한 필드만 로드)
-        document = (
-            db.query(DocumentModel)
-            .options(
-                selectinload(DocumentModel.files).load_only(
-                    DocumentFile.file_path,
-                    DocumentFile.original_filename,
-                    DocumentFile.content_type,
-                    DocumentFile.processing_status,  # 파일 처리 상태 추가
-                    DocumentFile.file_metadata,  # 파일 메타데이터 추가
-                )
-            )
-            .filter(DocumentModel.id == document_id)
-            .first()
-        )
+        result = await db.execute(_DOCUMENT_FILE_DOWNLOAD_QUERY.where(DocumentModel.id == document_id))
+        document = result.scalar_one_or_none()
 
         if not document:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
@@ -751,50 +825,13 @@ async def download_document_file(
         if file_info.processing_status != "completed":
             # 파일이 아직 처리 중인 경우
             if file_info.processing_status == "processing":
-                # 작업 ID가 있는지 확인하여 상태 업데이트
-                task_id = None
-                if file_info.file_metadata and "task_id" in file_info.file_metadata:
-                    task_id = file_info.file_metadata["task_id"]
-
-                    # Celery 작업 상태 확인
-                    try:
-                        from app.celery_worker import celery
-                        from celery.result import AsyncResult
-
-                        task_result = AsyncResult(task_id, app=celery)
-
-                        # 작업이 완료된 경우 파일 상태 업데이트
-                        if task_result.status == "SUCCESS":
-                            file_info.processing_status = "completed"
-                            db.commit()
-                        elif task_result.status == "FAILURE":
-                            # 실패한 작업이면 실패로 상태 변경
-                            file_info.processing_status = "failed"
-                            file_metadata = file_info.file_metadata or {}
-                            file_metadata["upload_error"] = str(task_result.result)
-                            file_info.file_metadata = file_metadata
-                            db.commit()
-
-                            # 실패 메시지 반환
-                            raise HTTPException(
-                                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                                detail=f"File upload failed: {str(task_result.result)}",
-                            )
-                        else:
-                            # 아직 처리 중
-                            raise HTTPException(
-                                status_code=status.HTTP_409_CONFLICT,
-                                detail=f"File is still being processed (task: {task_id}, status: {task_result.status}). Please try again later.",
-                            )
-                    except ImportError:
-                        # Celery 모듈 임포트 실패
-                        pass
-
-                # 작업 ID가 없거나 상태 확인에 실패한 경우
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="File is still being processed. Please try again later.",
-                )
+                # 업로드 작업이 끝나면 워커가 processing_status를 completed/failed로 기록하므로
+                # 요청 경로에서는 브로커(AsyncResult)를 조회하지 않고 DB 상태만 확인
+                task_id = (file_info.file_metadata or {}).get("task_id")
+                detail = "File is still being processed. Please try again later."
+                if task_id:
+                    detail = f"File is still being processed (task: {task_id}). Please try again later."
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
             # 파일 처리 실패한 경우
             elif file_info.processing_status == "failed":
                 error_message = "File processing failed"
@@ -802,30 +839,6 @@ async def download_document_file(
                     error_message += f": {file_info.file_metadata['upload_error']}"
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_message)
 
-        # 파일 존재 여부 확인 (NoSuchKey 오류 방지)
-        try:
-            from app.storage import check_file_exists
-
-            if not check_file_exists(file_info.file_path):
-                # 파일을 찾을 수 없는 경우 메타데이터 업데이트
-                file_info.processing_status = "failed"
-                metadata = file_info.file_metadata or {}
-                metadata["minio_error"] = "File marked as completed but not found in storage"
-                metadata["error_time"] = datetime.utcnow().isoformat()
-                file_info.file_metadata = metadata
-                db.commit()
-
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"File not found in storage. It may have been deleted.",
-                )
-        except Exception as err:
-            print(f"MinIO 파일 확인 오류 ({file_info.file_path}): {str(err)}")
-
-        # 다운로드 횟수 증가
-        document.download_count += 1
-        db.commit()
-
         # 항상 직접 스트리밍 방식 사용 (서명 검증 문제 방지)
         print(f"직접 스트리밍 방식으로 다운로드: {file_info.file_path}")
         content_type = file_info.content_type or "application/octet-stream"
@@ -834,29 +847,33 @@ async def download_document_file(
         from app.storage import get_file_stream
 
         try:
-            # 파일 스트림 생성
-            stream, size, actual_content_type = get_file_stream(file_info.file_path)
+            # 파일 스트림 생성 (별도의 존재 확인 요청 없이 바로 스트림을 열고, 파일이 없으면 NoSuchKey로 처리)
+            stream, size, actual_content_type, byte_range = await run_in_threadpool(
+                get_file_stream, file_info.file_path, range_header
+            )
+
+            # 다운로드 횟수 증가 (이어받기/탐색용 부분 요청은 제외)
+            if not byte_range or byte_range[0] == 0:
+                await _increment_counter(db, document_id, "download_count")
 
             # 실제 컨텐츠 타입 적용
             if actual_content_type and actual_content_type != "application/octet-stream":
                 content_type = actual_content_type
 
-            # 파일명 인코딩 처리 (한글 등 특수문자 지원)
-            encoded_filename = urllib.parse.quote(file_name)
-
             # 응답 헤더 설정
             headers = {
-                "Content-Disposition": f'attachment; filename="{encoded_filename}"',
+                "Content-Disposition": _content_disposition(file_name),
                 "Content-Type": content_type,
-                "Content-Length": str(size),
                 "Cache-Control": "no-cache, no-store, must-revalidate",
                 "Pragma": "no-cache",
                 "Expires": "0",
+                **_range_headers(byte_range, size),
             }
 
             # 스트리밍 응답 생성 (타임아웃 없음)
             response = StreamingResponse(
                 stream,
+                status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
                 headers=headers,
                 media_type=content_type,
             )
@@ -864,15 +881,31 @@ async def download_document_file(
             # 응답 반환
             return response
 
+        except RangeNotSatisfiableError as range_err:
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail=str(range_err),
+                headers={"Content-Range": f"bytes */{range_err.file_size}"},
+            )
         except Exception as stream_err:
             print(f"스트리밍 오류: {str(stream_err)}")
 
+            # 완료로 표시됐지만 스토리지에 없는 파일: 상태 기록은 감사 작업에 맡기고 바로 404 반환
+            if isinstance(stream_err, S3Error) and stream_err.code == "NoSuchKey":
+                from app.tasks.storage_tasks import verify_minio_object
+
+                verify_minio_object.delay(str(file_info.id))
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="File not found in storage. It may have been deleted.",
+                )
+
             # 예전 방식으로 대체 시도 (필요할 경우에만)
             if not direct:
                 from app.storage import get_download_url
 
                 # 서명된 URL 생성 시도
-                signed_url = get_download_url(file_info.file_path, expires=1800)
+                signed_url = await run_in_threadpool(get_download_url, file_info.file_path, expires=1800)
                 if signed_url:
                     print(f"서명된 URL 생성 성공 (예비 방식): {signed_url}")
                     return RedirectResponse(url=signed_url)
@@ -916,6 +949,7 @@ def approve_document_user(
     document.file_metadata = metadata
 
     db.commit()
+    cache_clear(SEARCH_CACHE)
     db.refresh(document)
 
     return document
@@ -953,6 +987,7 @@ def reject_document_user(
         document.file_metadata = metadata
 
     db.commit()
+    cache_clear(SEARCH_CACHE)
     db.refresh(document)
 
     return document
@@ -978,14 +1013,16 @@ class FileVisibilityRequest(BaseModel):
 
 # 파일 상태 확인 API
 @router.get("/{document_id}/files/status", response_model=List[FileStatusResponse])
-def check_document_files_status(
-    document_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+async def check_document_files_status(
+    document_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
 ):
     """문서에 속한 모든 파일의 상태를 조회합니다."""
     try:
         # 문서와 파일 정보 조회
-        document = (
-            db.query(DocumentModel)
+        result = await db.execute(
+            select(DocumentModel)
             .options(
                 selectinload(DocumentModel.files).load_only(
                     DocumentFile.id,
@@ -997,9 +1034,9 @@ def check_document_files_status(
                     DocumentFile.error_message,
                 )
             )
-            .filter(DocumentModel.id == document_id)
-            .first()
+            .where(DocumentModel.id == document_id)
         )
+        document = result.scalar_one_or_none()
 
         if not document:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
@@ -1019,10 +1056,11 @@ def check_document_files_status(
         file_paths = [file.file_path for file in document.files]
 
         # 파일 존재 여부 일괄 확인
-        files_exist = check_multiple_files_exist(file_paths)
+        files_exist = await check_multiple_files_exist(file_paths)
 
         # 파일별 상태 정보 구성
         file_statuses = []
+        status_changed = False
         for file in document.files:
             # MinIO에 파일 존재 여부
             exists_in_storage = files_exist.get(file.file_path, False)
@@ -1053,7 +1091,7 @@ def check_document_files_status(
                 metadata["error_time"] = datetime.utcnow().isoformat()
                 file.file_metadata = metadata
                 file.error_message = "File not found in storage"
-                db.commit()
+                status_changed = True
 
                 # 업데이트된 정보 반영
                 file_status["processing_status"] = "failed"
@@ -1062,6 +1100,10 @@ def check_document_files_status(
 
             file_statuses.append(file_status)
 
+        # 상태가 바뀐 파일은 한 번에 저장
+        if status_changed:
+            await db.commit()
+
         return file_statuses
     except Exception as e:
         print(f"파일 상태 확인 오류: {str(e)}")
@@ -1108,11 +1150,9 @@ async def reupload_document_file(
                 detail=f"Filename mismatch. Expected: {document_file.original_filename}, Got: {file.filename}",
             )
 
-        # 임시 파일로 저장
+        # 임시 파일로 저장 (전체 내용을 메모리에 올리지 않고 1MB 단위로 복사)
         temp_file_path = f"/tmp/{uuid.uuid4()}_{file.filename}"
-        with open(temp_file_path, "wb") as buffer:
-            file_content = await file.read()
-            buffer.write(file_content)
+        await run_in_threadpool(_save_upload_file, file, temp_file_path)
 
         # Celery 작업 실행 (비동기 처리)
         from app.tasks.file_tasks import upload_file_to_minio
@@ -1313,11 +1353,10 @@ async def upload_additional_files(
 
         # 파일 타입 검증
         for file in files:
-            file_extension = os.path.splitext(file.filename)[1].lower()
-            if file_extension not in ALLOWED_EXTENSIONS:
+            if _file_extension(file.filename) not in ALLOWED_EXTENSIONS:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File type not allowed for file '{file.filename}'. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}",
+                    detail=f"File type not allowed for file '{file.filename}'. Allowed types: {ALLOWED_EXTENSIONS_TEXT}",
                 )
 
         # 다중 파일 업로드 (비동기 처리)
@@ -1327,6 +1366,7 @@ async def upload_additional_files(
         document.status = "승인대기"
         document.updated_at = datetime.utcnow()
         db.commit()
+        await acache_clear(SEARCH_CACHE)
 
         # 응답 생성
         return {
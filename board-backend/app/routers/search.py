@@ -1,15 +1,42 @@
+import re
+import hashlib
+from collections import defaultdict
 from typing import List, Optional
+
+import orjson
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, func, desc, cast, String
 
 from app.database import get_db
+from app.cache import cache_get, cache_set
 from app.auth import get_current_active_user
 from app.schemas import SearchResult
 from app.models import Document, User, DocumentChunk
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+# 검색 결과 캐시 (승인 문서 기준 결과이므로 문서 상태 변경/삭제 시 무효화)
+SEARCH_CACHE = "search"
+SEARCH_CACHE_TTL = 60
+
+
+def _search_cache_key(scope: str, query: Optional[str], tags: Optional[List[str]], skip: int, limit: int) -> str:
+    # 검색어/태그 길이와 무관하게 키 길이를 고정
+    params = orjson.dumps([query, sorted(tags) if tags else [], skip, limit])
+    return f"{scope}:{hashlib.sha1(params).hexdigest()}"
+
+
+def _tags_filter(tags: List[str]):
+    # 태그마다 ANY 조건을 AND로 잇는 대신 한 번의 배열 포함(@>) 비교로 처리 (idx_document_tags GIN 인덱스 사용)
+    return Document.tags.contains([tag.lower() for tag in tags])
+
+
+def _cache_search_results(key: str, results: List[SearchResult]) -> List[dict]:
+    data = [result.model_dump(mode="json") for result in results]
+    cache_set(SEARCH_CACHE, key, data, SEARCH_CACHE_TTL)
+    return data
+
 
 # 키워드 기반 검색 API
 @router.get("", response_model=List[SearchResult])
@@ -21,6 +48,11 @@ def search_documents(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
+    cache_key = _search_cache_key("keyword", keyword, tags, skip, limit)
+    cached = cache_get(SEARCH_CACHE, cache_key)
+    if cached is not None:
+        return cached
+
     # 기본 쿼리 - 승인된 문서만 검색
     query = db.query(Document).filter(Document.status == "approved")
 
@@ -29,14 +61,13 @@ def search_documents(
         query = query.filter(
             or_(
                 Document.title.ilike(f"%{keyword}%"),
-                Document.tags.any(func.lower(keyword)),  # PostgreSQL의 array에서 검색
+                Document.tags.contains([keyword.lower()]),  # PostgreSQL의 array에서 검색 (GIN 인덱스 사용)
             )
         )
 
     # 태그 필터링
     if tags:
-        for tag in tags:
-            query = query.filter(Document.tags.any(func.lower(tag)))
+        query = query.filter(_tags_filter(tags))
 
     # 페이지네이션 및 실행
     documents = query.order_by(Document.created_at.desc()).offset(skip).limit(limit).all()
@@ -52,7 +83,7 @@ def search_documents(
         )
         results.append(result)
 
-    return results
+    return _cache_search_results(cache_key, results)
 
 
 # 태그 기반 검색 API
@@ -64,12 +95,16 @@ def search_by_tags(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
+    cache_key = _search_cache_key("tags", None, tags, skip, limit)
+    cached = cache_get(SEARCH_CACHE, cache_key)
+    if cached is not None:
+        return cached
+
     # 승인된 문서 중에서 태그로 검색
     query = db.query(Document).filter(Document.status == "approved")
 
-    # 각 태그에 대해 필터 적용
-    for tag in tags:
-        query = query.filter(Document.tags.any(func.lower(tag)))
+    # 모든 태그를 포함하는 문서만 필터링
+    query = query.filter(_tags_filter(tags))
 
     # 쿼리 실행
     documents = query.order_by(Document.created_at.desc()).offset(skip).limit(limit).all()
@@ -80,7 +115,7 @@ def search_by_tags(
         result = SearchResult(document=doc, relevance_score=None, highlights=None)
         results.append(result)
 
-    return results
+    return _cache_search_results(cache_key, results)
 
 
 # 문서 내용 기반 검색 API (DocumentChunk에서 검색)
@@ -93,63 +128,85 @@ def search_document_content(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    # 기본 쿼리 - DocumentChunk와 Document 조인
-    chunks_query = (
-        db.query(DocumentChunk, Document)
+    cache_key = _search_cache_key("content", keyword, tags, skip, limit)
+    cached = cache_get(SEARCH_CACHE, cache_key)
+    if cached is not None:
+        return cached
+
+    # 문서별 최고 유사도 점수 (청크와 키워드 간의 유사도 중 최댓값)
+    score = func.max(func.similarity(DocumentChunk.chunk_text, keyword)).label("score")
+
+    # 기본 쿼리 - DocumentChunk와 Document 조인 후 문서 단위로 그룹화
+    ranked_query = (
+        db.query(DocumentChunk.document_id, score)
         .join(Document, DocumentChunk.document_id == Document.id)
         .filter(Document.status == "approved")
     )
 
     # 키워드로 청크 내용 검색
     if keyword:
-        chunks_query = chunks_query.filter(DocumentChunk.chunk_text.ilike(f"%{keyword}%"))
+        ranked_query = ranked_query.filter(DocumentChunk.chunk_text.ilike(f"%{keyword}%"))
 
     # 태그 필터링
     if tags:
-        for tag in tags:
-            chunks_query = chunks_query.filter(Document.tags.any(func.lower(tag)))
-
-    # 중복 제거를 위해 document_id로 그룹화하고 관련성 점수 계산
-    document_ids = set()
-    document_scores = {}
-
-    # 페이지네이션 관련 변수
-    chunk_results = chunks_query.order_by(desc(func.similarity(DocumentChunk.chunk_text, keyword))).all()
-
-    documents = []
-    for chunk, doc in chunk_results:
-        if doc.id not in document_ids:
-            document_ids.add(doc.id)
-            # 관련성 점수 계산 (문서 청크와 키워드 간의 유사도)
-            relevance_score = func.similarity(chunk.chunk_text, keyword)
-            document_scores[doc.id] = relevance_score
-            documents.append(doc)
-
-            # 페이지네이션 적용
-            if len(documents) >= limit:
-                break
+        ranked_query = ranked_query.filter(_tags_filter(tags))
+
+    # 중복 제거와 페이지네이션을 DB에서 처리 (해당 페이지의 문서 ID와 점수만 전송)
+    ranked_rows = (
+        ranked_query.group_by(DocumentChunk.document_id)
+        .order_by(desc("score"), DocumentChunk.document_id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    document_scores = dict(ranked_rows)
+
+    # 페이지에 해당하는 문서만 한 번에 조회하고 점수 순서를 유지
+    documents_by_id = {}
+    if document_scores:
+        documents_by_id = {
+            doc.id: doc for doc in db.query(Document).filter(Document.id.in_(list(document_scores))).all()
+        }
+    page_documents = [documents_by_id[document_id] for document_id in document_scores if document_id in documents_by_id]
+
+    # 하이라이트 위치 탐색용 패턴 (청크마다 소문자 사본을 만들지 않도록 대소문자 무시 정규식을 한 번만 컴파일)
+    keyword_pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+
+    # 하이라이트용 청크를 문서별 최대 3개씩 한 번의 쿼리로 조회 (문서마다 조회하지 않음)
+    chunk_texts_by_document = defaultdict(list)
+    if page_documents:
+        ranked_chunks = (
+            db.query(
+                DocumentChunk.document_id,
+                DocumentChunk.chunk_text,
+                func.row_number()
+                .over(partition_by=DocumentChunk.document_id, order_by=DocumentChunk.chunk_index)
+                .label("rank"),
+            )
+            .filter(
+                DocumentChunk.document_id.in_([doc.id for doc in page_documents]),
+                DocumentChunk.chunk_text.ilike(f"%{keyword}%"),
+            )
+            .subquery()
+        )
+        highlight_rows = (
+            db.query(ranked_chunks.c.document_id, ranked_chunks.c.chunk_text).filter(ranked_chunks.c.rank <= 3).all()
+        )
+        for document_id, chunk_text in highlight_rows:
+            chunk_texts_by_document[document_id].append(chunk_text)
 
     # 결과 포맷팅
     results = []
-    for doc in documents[skip : skip + limit]:
+    for doc in page_documents:
         # 청크 텍스트에서 키워드 주변 텍스트 추출 (하이라이트)
         highlights = []
-        doc_chunks = (
-            db.query(DocumentChunk)
-            .filter(DocumentChunk.document_id == doc.id, DocumentChunk.chunk_text.ilike(f"%{keyword}%"))
-            .limit(3)
-            .all()
-        )
-
-        for chunk in doc_chunks:
+        for text in chunk_texts_by_document[doc.id]:
             # 간단한 하이라이트 생성
-            text = chunk.chunk_text
-            keyword_lower = keyword.lower()
-            start_pos = text.lower().find(keyword_lower)
-            if start_pos >= 0:
+            match = keyword_pattern.search(text)
+            if match:
                 # 키워드 앞뒤 50자 정도를 표시
-                start = max(0, start_pos - 50)
-                end = min(len(text), start_pos + len(keyword) + 50)
+                start = max(0, match.start() - 50)
+                end = min(len(text), match.end() + 50)
                 context = text[start:end]
 
                 # 키워드가 중간에 잘리지 않도록 조정
@@ -167,7 +224,7 @@ def search_document_content(
         )
         results.append(result)
 
-    return results
+    return _cache_search_results(cache_key, results)
 
 
 # 유사 문서명 검색 API
@@ -180,6 +237,11 @@ def search_similar_title(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
+    cache_key = _search_cache_key("similar_title", title, tags, skip, limit)
+    cached = cache_get(SEARCH_CACHE, cache_key)
+    if cached is not None:
+        return cached
+
     # 기본 쿼리 - 승인된 문서만 검색
     query = db.query(Document, func.similarity(Document.title, title).label("similarity")).filter(
         Document.status == "approved"
@@ -187,8 +249,7 @@ def search_similar_title(
 
     # 태그 필터링
     if tags:
-        for tag in tags:
-            query = query.filter(Document.tags.any(func.lower(tag)))
+        query = query.filter(_tags_filter(tags))
 
     # 유사도 점수를 기준으로 정렬
     documents = query.order_by(desc("similarity")).offset(skip).limit(limit).all()
@@ -203,7 +264,7 @@ def search_similar_title(
         )
         results.append(result)
 
-    return results
+    return _cache_search_results(cache_key, results)
 
 
 # 패턴 검색 API (와일드카드 사용)
@@ -216,6 +277,11 @@ def search_by_pattern(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
+    cache_key = _search_cache_key("pattern", pattern, tags, skip, limit)
+    cached = cache_get(SEARCH_CACHE, cache_key)
+    if cached is not None:
+        return cached
+
     # 와일드카드 * ? 를 SQL LIKE 패턴으로 변환
     sql_pattern = pattern.replace("*", "%").replace("?", "_")
 
@@ -227,8 +293,7 @@ def search_by_pattern(
 
     # 태그 필터링
     if tags:
-        for tag in tags:
-            query = query.filter(Document.tags.any(func.lower(tag)))
+        query = query.filter(_tags_filter(tags))
 
     # 쿼리 실행
     documents = query.order_by(Document.created_at.desc()).offset(skip).limit(limit).all()
@@ -243,4 +308,4 @@ def search_by_pattern(
         )
         results.append(result)
 
-    return results
+    return _cache_search_results(cache_key, results)
@@ -6,6 +6,8 @@ from uuid import UUID
 
 from app.database import get_db
 from app.auth import get_current_active_user
+from app.cache import acache_clear
+from app.routers.admin_tags import ADMIN_TAGS_CACHE
 from app.models import Tag, UserTag, UserTagQuota, User
 from app.schemas import TagResponse, TagCreate, TagUpdate, UserTagResponse, Message, UserTagQuotaResponse
 
@@ -28,7 +30,6 @@ async def get_available_tags(
     if search:
         query = query.filter(Tag.name.ilike(f"%{search}%"))
 
-    total = query.count()
     tags = query.offset(skip).limit(limit).all()
 
     return tags
@@ -48,7 +49,6 @@ async def get_my_tags(
     if search:
         query = query.join(Tag).filter(Tag.name.ilike(f"%{search}%"))
 
-    total = query.count()
     user_tags = query.offset(skip).limit(limit).all()
 
     return user_tags
@@ -58,7 +58,7 @@ async def get_my_tags(
 async def add_tag(tag_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     """기존 태그를 내 태그로 추가합니다."""
     # 태그 존재 여부 확인
-    tag = db.query(Tag).filter(Tag.id == tag_id).first()
+    tag = db.get(Tag, tag_id)
     if not tag:
         raise HTTPException(status_code=404, detail="태그를 찾을 수 없습니다.")
 
@@ -104,6 +104,7 @@ async def create_and_add_tag(
     new_tag = Tag(name=tag.name, description=tag.description, is_system=False, created_by=current_user.id)
     db.add(new_tag)
     db.commit()
+    await acache_clear(ADMIN_TAGS_CACHE)
     db.refresh(new_tag)
 
     # 생성한 태그를 사용자 태그로 추가
@@ -182,6 +183,7 @@ async def create_personal_tag(
     )
     db.add(new_tag)
     db.commit()
+    await acache_clear(ADMIN_TAGS_CACHE)
     db.refresh(new_tag)
 
     return new_tag
@@ -196,9 +198,9 @@ async def update_personal_tag(
 ):
     """개인 태그를 수정합니다."""
     # 태그 존재 여부 및 소유권 확인
-    tag = db.query(Tag).filter(Tag.id == tag_id, Tag.created_by == current_user.id, Tag.is_system == False).first()
+    tag = db.get(Tag, tag_id)
 
-    if not tag:
+    if not tag or tag.created_by != current_user.id or tag.is_system:
         raise HTTPException(status_code=404, detail="태그를 찾을 수 없거나 수정 권한이 없습니다.")
 
     # 이름 변경 시 중복 체크
@@ -221,6 +223,7 @@ async def update_personal_tag(
         tag.color = tag_update.color
 
     db.commit()
+    await acache_clear(ADMIN_TAGS_CACHE)
     db.refresh(tag)
     return tag
 
@@ -231,9 +234,9 @@ async def delete_personal_tag(
 ):
     """개인 태그를 삭제합니다."""
     # 태그 존재 여부 및 소유권 확인
-    tag = db.query(Tag).filter(Tag.id == tag_id, Tag.created_by == current_user.id, Tag.is_system == False).first()
+    tag = db.get(Tag, tag_id)
 
-    if not tag:
+    if not tag or tag.created_by != current_user.id or tag.is_system:
         raise HTTPException(status_code=404, detail="태그를 찾을 수 없거나 삭제 권한이 없습니다.")
 
     # 연관된 문서-태그 관계 삭제
@@ -242,6 +245,7 @@ async def delete_personal_tag(
     # 태그 삭제
     db.delete(tag)
     db.commit()
+    await acache_clear(ADMIN_TAGS_CACHE)
 
     return {"message": "태그가 성공적으로 삭제되었습니다."}
 
@@ -260,7 +264,6 @@ async def get_personal_tags(
     if search:
         query = query.filter(Tag.name.ilike(f"%{search}%"))
 
-    total = query.count()
     tags = query.order_by(Tag.name).offset(skip).limit(limit).all()
 
     return tags
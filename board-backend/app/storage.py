@@ -1,12 +1,15 @@
 import os
 import uuid
+import asyncio
 import json
 import tempfile
 from minio import Minio
 from minio.error import S3Error
 from fastapi import UploadFile
-from typing import List, Dict, Tuple, Optional, BinaryIO
+from starlette.concurrency import run_in_threadpool
+from typing import List, Dict, Tuple, Optional, BinaryIO, Iterator
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
 import io
 import logging
 import time
@@ -22,6 +25,12 @@ minio_client = Minio(
     secure=settings.MINIO_SECURE,
 )
 
+# 여러 파일 존재 확인 시 동시에 보내는 MinIO 요청 수 (공유 클라이언트의 연결 풀 크기 10에 맞춤)
+EXISTS_CHECK_CONCURRENCY = 10
+
+# 파일 다운로드 스트리밍 청크 크기 (1MB)
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 # MinIO 외부 엔드포인트 - 환경 변수에서 가져오거나 기본값 사용
 # 기본값: http://localhost:9000 (개발 환경용)
 MINIO_EXTERNAL_ENDPOINT = os.environ.get("MINIO_EXTERNAL_ENDPOINT", "localhost:9000")
@@ -116,7 +125,11 @@ async def upload_file(file: UploadFile, user_id: str) -> str:
 
 # 다중 파일 업로드 함수 - 비동기 처리 지원
 async def upload_multiple_files(
-    files: List[UploadFile], user_id: str, document_id: str = None, async_processing: bool = False
+    files: List[UploadFile],
+    user_id: str,
+    document_id: str = None,
+    async_processing: bool = False,
+    first_task_id: Optional[str] = None,
 ) -> List[Dict[str, str]]:
     """
     여러 파일을 MinIO에 업로드하는 함수
@@ -126,6 +139,7 @@ async def upload_multiple_files(
         user_id: 사용자 ID
         document_id: 문서 ID (비동기 처리시 필요)
         async_processing: 비동기 처리 여부
+        first_task_id: 첫 번째 파일의 비동기 작업에 사용할 작업 ID (미리 발급한 경우)
 
     Returns:
         업로드 결과 목록 (파일 정보 포함)
@@ -247,11 +261,14 @@ async def upload_multiple_files(
 
                 # 파일 경로와 file_id를 전달하여 비동기 작업 등록
                 file_id = db_file.id if db_file else None
-                task = upload_file_to_minio.delay(
-                    temp_file_path,
-                    unique_filename,  # 플랫 구조의 경로
-                    str(validated_document_id),
-                    str(file_id) if file_id else None,
+                task = upload_file_to_minio.apply_async(
+                    args=(
+                        temp_file_path,
+                        unique_filename,  # 플랫 구조의 경로
+                        str(validated_document_id),
+                        str(file_id) if file_id else None,
+                    ),
+                    task_id=first_task_id if not tasks else None,
                 )
 
                 # 작업 ID 저장
@@ -440,39 +457,96 @@ def get_download_url(file_path: str, expires=3600) -> str:
 
 # 다중 파일 다운로드 링크 생성 함수
 def get_multiple_download_urls(file_path: List[str], expires=3600) -> List[Dict[str, str]]:
-    download_urls = []
-
     # 정수 초를 timedelta 객체로 변환
     expires_delta = timedelta(seconds=expires)
 
-    for path in file_path:
+    def presign(path: str) -> Optional[Dict[str, str]]:
         try:
             url = minio_client.presigned_get_object(settings.MINIO_BUCKET_NAME, path, expires=expires_delta)
-
-            # 내부 URL을 외부 URL로 변환
-            external_url = convert_internal_url_to_external(url)
-
-            # 원본 파일명을 파일 경로에서 추출 (저장된 메타데이터에서 얻을 수도 있음)
-            file_name = os.path.basename(path)
-            download_urls.append({"path": path, "url": external_url, "filename": file_name})
         except S3Error as err:
             print(f"Error occurred: {err}")
-            # 개별 파일 오류는 건너뛰기
-            continue
+            return None
+
+        # 내부 URL을 외부 URL로 변환
+        external_url = convert_internal_url_to_external(url)
+
+        # 원본 파일명을 파일 경로에서 추출 (저장된 메타데이터에서 얻을 수도 있음)
+        file_name = os.path.basename(path)
+        return {"path": path, "url": external_url, "filename": file_name}
+
+    # 파일이 여러 개면 서명 URL 생성을 스레드풀에서 동시에 처리 (결과 순서는 입력 순서 유지)
+    if len(file_path) > 1:
+        with ThreadPoolExecutor(max_workers=min(32, len(file_path))) as executor:
+            results = list(executor.map(presign, file_path))
+    else:
+        results = [presign(path) for path in file_path]
+
+    # 개별 파일 오류는 건너뛰기
+    return [result for result in results if result]
 
-    return download_urls
+
+class RangeNotSatisfiableError(Exception):
+    """요청한 Range가 파일 크기를 벗어난 경우 (HTTP 416)"""
+
+    def __init__(self, file_size: int):
+        super().__init__(f"Requested range not satisfiable (size: {file_size})")
+        self.file_size = file_size
+
+
+def parse_range_header(range_header: Optional[str], file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    HTTP Range 헤더(bytes=start-end, bytes=start-, bytes=-suffix)를 (start, end) 바이트 구간으로 변환
+
+    형식이 잘못되었거나 다중 구간인 경우 None을 반환하여 전체 파일을 전송하도록 함
+
+    Raises:
+        RangeNotSatisfiableError: 시작 위치가 파일 크기 이상인 경우
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.strip().partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, sep, end_text = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else None
+        else:
+            # 마지막 N바이트 요청
+            suffix = int(end_text)
+            if suffix == 0:
+                raise RangeNotSatisfiableError(file_size)
+            start = max(file_size - suffix, 0)
+            end = file_size - 1
+    except ValueError:
+        return None
+    if start < 0 or (end is not None and end < start):
+        return None
+    if start >= file_size:
+        raise RangeNotSatisfiableError(file_size)
+    return start, file_size - 1 if end is None else min(end, file_size - 1)
 
 
 # 파일 스트리밍 함수 - 큰 파일 지원
-def get_file_stream(file_path: str) -> Tuple[BinaryIO, int, str]:
+def get_file_stream(
+    file_path: str, range_header: Optional[str] = None
+) -> Tuple[Iterator[bytes], int, str, Optional[Tuple[int, int]]]:
     """
     MinIO에서 파일을 스트리밍하기 위한 함수 - 대용량 파일 지원 버전
 
     Args:
         file_path: MinIO에 저장된 파일 경로
+        range_header: 클라이언트의 Range 헤더 (지정 시 해당 구간만 MinIO에서 읽음)
 
     Returns:
-        (file_stream, file_size, content_type): 파일 스트림, 파일 크기, 컨텐츠 타입
+        (file_stream, file_size, content_type, byte_range): 파일 스트림, 전체 파일 크기, 컨텐츠 타입,
+        전송 구간 (start, end) 또는 전체 전송 시 None
+
+    Raises:
+        RangeNotSatisfiableError: 요청한 Range가 파일 크기를 벗어난 경우
     """
     attempts = 0
     max_attempts = 3
@@ -502,23 +576,25 @@ def get_file_stream(file_path: str) -> Tuple[BinaryIO, int, str]:
                     time.sleep(1)
                     continue
 
+            # Range 요청이면 해당 구간만 조회
+            byte_range = parse_range_header(range_header, file_size)
+            offset, length = (byte_range[0], byte_range[1] - byte_range[0] + 1) if byte_range else (0, 0)
+
             # 파일 스트림 생성 (버퍼 크기 지정)
             # response_content_type 파라미터 추가로 타입 제어
             data = stream_client.get_object(
                 settings.MINIO_BUCKET_NAME,
                 file_path,
+                offset=offset,
+                length=length,
                 request_headers={"Accept-Encoding": "identity"},  # 압축 해제 방지
             )
 
             # 청크 기반 스트리밍을 위한 제너레이터 함수
             def generate_chunks():
-                buffer_size = 4 * 1024 * 1024  # 4MB 버퍼 크기
                 try:
-                    # 청크 단위로 파일 데이터 스트리밍
-                    chunk = data.read(buffer_size)
-                    while chunk:
-                        yield chunk
-                        chunk = data.read(buffer_size)
+                    # urllib3 응답을 1MB 단위로 그대로 전달 (압축 해제/재버퍼링 없음)
+                    yield from data.stream(STREAM_CHUNK_SIZE, decode_content=False)
                 except Exception as e:
                     print(f"청크 스트리밍 오류: {str(e)}")
                 finally:
@@ -532,8 +608,10 @@ def get_file_stream(file_path: str) -> Tuple[BinaryIO, int, str]:
             print(f"파일 스트림 생성 성공 (청크 방식): {file_path} (크기: {file_size}, 타입: {content_type})")
 
             # 제너레이터 객체와 메타데이터 반환
-            return generate_chunks(), file_size, content_type
+            return generate_chunks(), file_size, content_type, byte_range
 
+        except RangeNotSatisfiableError:
+            raise
         except Exception as err:
             last_error = err
             print(f"스트리밍 오류 (시도 {attempts}/{max_attempts}): {str(err)}")
@@ -591,16 +669,7 @@ def check_file_exists(file_path: str, max_attempts: int = 3) -> bool:
     """
     for attempt in range(max_attempts):
         try:
-            # MinIO 클라이언트 재설정 (인증 문제 방지)
-            global minio_client
-            minio_client = Minio(
-                settings.MINIO_ENDPOINT,
-                access_key=settings.MINIO_ACCESS_KEY,
-                secret_key=settings.MINIO_SECRET_KEY,
-                secure=settings.MINIO_SECURE,
-            )
-
-            # 파일 존재 확인
+            # 파일 존재 확인 (여러 스레드에서 동시에 호출되므로 공유 클라이언트는 읽기만 함)
             stat_result = minio_client.stat_object(settings.MINIO_BUCKET_NAME, file_path)
 
             # 파일 크기 검증
@@ -629,7 +698,7 @@ def check_file_exists(file_path: str, max_attempts: int = 3) -> bool:
 
 
 # 여러 파일의 존재 여부 일괄 확인 함수
-def check_multiple_files_exist(file_paths: List[str]) -> Dict[str, bool]:
+async def check_multiple_files_exist(file_paths: List[str]) -> Dict[str, bool]:
     """
     여러 파일의 존재 여부를 일괄 확인하는 함수
 
@@ -639,7 +708,39 @@ def check_multiple_files_exist(file_paths: List[str]) -> Dict[str, bool]:
     Returns:
         {파일경로: 존재여부} 형태의 딕셔너리
     """
-    results = {}
-    for path in file_paths:
-        results[path] = check_file_exists(path)
-    return results
+    if not file_paths:
+        return {}
+
+    # 모든 파일이 같은 폴더 아래에 있으면 목록 조회 한 번으로 확인
+    prefix = _shared_prefix(file_paths) if len(file_paths) > 1 else ""
+    if prefix:
+        try:
+            existing = await run_in_threadpool(list_existing_objects, prefix)
+            return {path: path in existing for path in file_paths}
+        except Exception as err:
+            print(f"MinIO 목록 조회 실패, 개별 확인으로 대체: {str(err)}")
+
+    # 공통 폴더가 없으면(플랫 구조) 파일별 확인을 동시에 수행 (MinIO 연결 고갈 방지를 위해 동시 요청 수 제한)
+    semaphore = asyncio.Semaphore(EXISTS_CHECK_CONCURRENCY)
+
+    async def check_one(path: str) -> bool:
+        async with semaphore:
+            return await run_in_threadpool(check_file_exists, path)
+
+    results = await asyncio.gather(*(check_one(path) for path in file_paths))
+    return dict(zip(file_paths, results))
+
+
+def _shared_prefix(file_paths: List[str]) -> str:
+    """파일 경로들의 공통 폴더 접두사 ("a/b/" 형태, 없으면 빈 문자열)"""
+    common = os.path.commonprefix(file_paths)
+    return common[: common.rfind("/") + 1]
+
+
+def list_existing_objects(prefix: str) -> set:
+    """접두사 아래에 있는 크기 0이 아닌 객체 이름 집합을 조회 (check_file_exists와 같은 기준)"""
+    return {
+        obj.object_name
+        for obj in minio_client.list_objects(settings.MINIO_BUCKET_NAME, prefix=prefix, recursive=True)
+        if obj.size
+    }
@@ -0,0 +1,262 @@
+import os
+import re
+import logging
+import uuid
+import asyncio
+import aiohttp
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+import fitz  # PyMuPDF
+from celery.signals import worker_process_shutdown
+from docx import Document as DocxDocument
+from typing import List, Optional, Tuple
+
+from app.celery_worker import celery
+from app.database import SessionLocal
+from app.models import Document, DocumentChunk
+from app.storage import get_download_url
+
+logger = logging.getLogger(__name__)
+
+# 기본 청크 사이즈 (문자 수)
+DEFAULT_CHUNK_SIZE = 1000
+
+# 문장 종결 문자(. ! ? 줄바꿈)와 청크 내 마지막 종결 문자까지 매칭하는 패턴
+_SENTENCE_TERMINATORS = frozenset(".!?\n")
+_SENTENCE_END = re.compile(r".*[.!?\n]", re.DOTALL)
+
+# 병렬 구간(Range) 다운로드 설정
+RANGE_PART_SIZE = 4 << 20
+RANGE_CONCURRENCY = 8
+
+# PDF 페이지 병렬 추출 설정 (페이지 수가 적으면 스레드 생성 비용이 더 커서 순차 처리)
+PDF_PARALLEL_MIN_PAGES = 16
+PDF_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# 워커 프로세스당 하나의 이벤트 루프와 HTTP 세션을 재사용 (작업마다 TCP/TLS 연결을 새로 맺지 않도록)
+HTTP_POOL_SIZE = 32
+_loop = None
+_http_session = None
+
+# Chonkie가 설치된 경우 재귀 청커 사용 (없으면 기본 분할 방식으로 동작)
+CHONKIE_ENABLED = False
+try:
+    from chonkie import RecursiveChunker
+
+    # 청커는 초기화 비용이 있으므로 모듈 로드 시 한 번만 생성
+    _recursive_chunker = RecursiveChunker(chunk_size=DEFAULT_CHUNK_SIZE)
+    CHONKIE_ENABLED = True
+except ImportError as e:
+    logger.warning(f"Chonkie 로드 실패 (오류: {str(e)}): 기본 청킹 방식을 사용합니다.")
+
+
+# 문서 청킹 유틸리티 함수
+def chunk_text(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[str]:
+    """텍스트를 청크로 분할하는 함수"""
+    # 기본 청크 사이즈는 Chonkie 재귀 청커로 분할 (문단 > 문장 > 단어 경계 순으로 분할)
+    if CHONKIE_ENABLED and chunk_size == DEFAULT_CHUNK_SIZE:
+        return [chunk.text for chunk in _recursive_chunker.chunk(text)]
+
+    chunks = []
+
+    # 청크 사이즈 단위로 분할
+    text_length = len(text)
+    for i in range(0, text_length, chunk_size):
+        chunk = text[i : i + chunk_size]
+        # 문장 단위로 분할되도록 조정 (마지막 청크이거나 경계가 이미 문장 끝이면 건너뜀)
+        if i + chunk_size < text_length and text[i + chunk_size] not in _SENTENCE_TERMINATORS:
+            # 문장 끝 찾기 (마지막 문장 종결 문자까지 한 번에 매칭)
+            match = _SENTENCE_END.match(chunk)
+            end_pos = match.end() - 1 if match else -1
+
+            if end_pos != -1 and end_pos > chunk_size // 2:
+                chunk = chunk[: end_pos + 1]
+
+        chunks.append(chunk)
+
+    return chunks
+
+
+def _run(coro):
+    """워커의 공용 이벤트 루프에서 코루틴을 실행하는 함수"""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """연결 풀을 공유하는 aiohttp 세션을 반환하는 함수 (공용 이벤트 루프 안에서 호출)"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=60),
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE),
+        )
+    return _http_session
+
+
+@worker_process_shutdown.connect
+def _close_http_session(**kwargs):
+    """워커 프로세스 종료 시 HTTP 세션과 이벤트 루프 정리"""
+    if _loop is None or _loop.is_closed():
+        return
+    if _http_session is not None and not _http_session.closed:
+        _loop.run_until_complete(_http_session.close())
+    _loop.close()
+
+
+# 파일 다운로드 함수
+async def download_bytes(url: str) -> bytes:
+    """URL의 파일을 메모리로 받는 함수 (Range 요청을 지원하면 구간별로 병렬 다운로드)"""
+    session = _get_http_session()
+    # 첫 구간을 받으면서 전체 크기와 Range 지원 여부 확인
+    # (presigned URL은 GET 메서드로 서명되어 있어 HEAD 대신 Range GET 사용)
+    async with session.get(url, headers={"Range": f"bytes=0-{RANGE_PART_SIZE - 1}"}) as response:
+        response.raise_for_status()
+        content_range = response.headers.get("Content-Range", "")
+        total = content_range.rsplit("/", 1)[-1]
+
+        if response.status != 206 or not total.isdigit():
+            # Range 미지원: 전체를 한 번에 수신
+            return await response.read()
+
+        total = int(total)
+        first_part = await response.read()
+
+    # 전체 크기만큼 버퍼를 미리 잡아두고 각 구간을 해당 위치에 채움
+    buffer = bytearray(total)
+    buffer[: len(first_part)] = first_part
+    semaphore = asyncio.Semaphore(RANGE_CONCURRENCY)
+
+    async def fetch_part(start: int):
+        end = min(start + RANGE_PART_SIZE, total) - 1
+        async with semaphore:
+            async with session.get(url, headers={"Range": f"bytes={start}-{end}"}) as part:
+                part.raise_for_status()
+                buffer[start : end + 1] = await part.read()
+
+    await asyncio.gather(*(fetch_part(start) for start in range(RANGE_PART_SIZE, total, RANGE_PART_SIZE)))
+    return bytes(buffer)
+
+
+def _parse_pdf_pages(data: bytes, start: int, stop: int) -> List[Tuple[str, int]]:
+    """PDF의 [start, stop) 구간 페이지 텍스트를 추출하는 함수 (페이지 번호는 1부터 시작)"""
+    # fitz.Document는 스레드 간 공유가 안전하지 않으므로 구간마다 같은 바이트에서 따로 연다
+    with fitz.open(stream=data, filetype="pdf") as pdf:
+        return [(pdf.load_page(i).get_text(), i + 1) for i in range(start, stop)]
+
+
+# 파일 파싱 함수 (CPU 작업이므로 스레드에서 실행)
+def _parse_file(data: bytes, file_type: str) -> List[Tuple[str, Optional[int]]]:
+    """다운로드한 문서 바이트에서 (페이지 텍스트, 페이지 번호) 목록을 추출하는 동기 함수"""
+    if file_type == "pdf":
+        # PyMuPDF(MuPDF C 엔진)로 페이지별 텍스트 추출
+        with fitz.open(stream=data, filetype="pdf") as pdf:
+            page_count = pdf.page_count
+            if page_count < PDF_PARALLEL_MIN_PAGES or PDF_MAX_WORKERS == 1:
+                return [(page.get_text(), page.number + 1) for page in pdf]
+
+        # 페이지가 많으면 구간을 나눠 여러 스레드에서 동시에 추출
+        step = -(-page_count // PDF_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=PDF_MAX_WORKERS) as executor:
+            parts = executor.map(
+                lambda start: _parse_pdf_pages(data, start, min(start + step, page_count)), range(0, page_count, step)
+            )
+            return [page for part in parts for page in part]
+
+    elif file_type == "docx":
+        doc = DocxDocument(BytesIO(data))
+        text = ""
+        for para in doc.paragraphs:
+            text += para.text + "\n"
+        # 페이지 정보가 없는 형식은 파일 전체를 한 덩어리로 취급
+        return [(text, None)]
+
+    elif file_type == "txt":
+        return [(data.decode("utf-8"), None)]
+
+    else:
+        return []
+
+
+# 문서에서 페이지별 텍스트 추출 함수
+async def extract_pages(file_path: str, file_type: str) -> List[Tuple[str, Optional[int]]]:
+    """문서 파일에서 (페이지 텍스트, 페이지 번호) 목록을 추출하는 함수"""
+    # MinIO에서 파일을 메모리로 다운로드 (임시 파일을 거치지 않음)
+    download_url = get_download_url(file_path)
+    data = await download_bytes(download_url)
+
+    # 파일 타입에 따라 텍스트 추출 (파싱은 스레드에서 실행해 이벤트 루프를 막지 않음)
+    return await asyncio.to_thread(_parse_file, data, file_type)
+
+
+async def _extract_all(files) -> List[List[Tuple[str, Optional[int]]]]:
+    """여러 파일의 페이지를 동시에 추출 (gather는 _run의 이벤트 루프 안에서 생성되어야 함)"""
+    return await asyncio.gather(*(extract_pages(file.file_path, file.file_type) for file in files))
+
+
+# Milvus 벡터 저장 함수 (실제 구현은 향후 개발)
+def store_vectors(chunks: List[str], document_id: uuid.UUID) -> List[str]:
+    """텍스트 청크를 벡터로 변환하여 Milvus에 저장하는 함수"""
+    # 실제 Milvus 연동은 향후 구현
+    # 지금은 임시 벡터 ID 반환
+    vector_ids = [str(uuid.uuid4()) for _ in chunks]
+    return vector_ids
+
+
+@celery.task(name="chunk_document", bind=True)
+def chunk_document(self, document_id):
+    """
+    문서 파일에서 텍스트를 추출해 청크로 분할하고 저장하는 작업
+
+    Args:
+        document_id: 청킹할 문서 ID
+    """
+    task_id = self.request.id
+    logger.info(f"Task {task_id}: 문서 청킹 시작 - 문서 ID: {document_id}")
+
+    db = SessionLocal()
+    try:
+        document = db.get(Document, uuid.UUID(str(document_id)))
+        if not document:
+            raise ValueError(f"Document not found: {document_id}")
+
+        # 문서의 모든 파일에서 페이지별 텍스트 추출
+        # (파일들은 공용 이벤트 루프에서 동시에 다운로드)
+        file_pages = _run(_extract_all(document.files))
+        pages = [page for pages_of_file in file_pages for page in pages_of_file]
+
+        # 페이지 단위로 청킹 (청크가 페이지 경계를 넘지 않도록 해 페이지 번호를 그대로 유지)
+        page_chunks = [(chunk, page) for page_text, page in pages for chunk in chunk_text(page_text) if chunk.strip()]
+        text_chunks = [chunk for chunk, _ in page_chunks]
+
+        # Milvus에 벡터 저장 (향후 실제 구현, 문서 ID는 UUID 그대로 전달)
+        vector_ids = store_vectors(text_chunks, document.id)
+
+        # 같은 페이지의 청크는 메타데이터 dict를 공유 (페이지 정보가 없으면 빈 메타데이터)
+        page_metadata = {}
+
+        # 청크를 데이터베이스에 한 번에 저장 (ORM 객체 생성 없이 일괄 INSERT)
+        db_chunks = [
+            {
+                "document_id": document.id,
+                "chunk_text": chunk,
+                "chunk_index": i,
+                "vector_id": vector_id,
+                "chunk_metadata": page_metadata.setdefault(page, {} if page is None else {"page": page}),
+            }
+            for i, ((chunk, page), vector_id) in enumerate(zip(page_chunks, vector_ids))
+        ]
+        db.bulk_insert_mappings(DocumentChunk, db_chunks)
+
+        db.commit()
+
+        logger.info(f"Task {task_id}: 문서 청킹 완료 - 청크 {len(db_chunks)}개 생성")
+        return {"document_id": str(document_id), "chunk_count": len(db_chunks)}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Task {task_id}: 문서 청킹 실패 - {str(e)}")
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,69 @@
+import logging
+import uuid
+from datetime import datetime
+from typing import List
+
+from app.celery_worker import celery
+from app.database import SessionLocal
+from app.models import DocumentFile
+from app.storage import check_file_exists, delete_multiple_files
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(name="delete_files_from_minio", bind=True, max_retries=5)
+def delete_files_task(self, paths: List[str]):
+    """
+    MinIO에 저장된 파일들을 삭제하는 작업 (실패한 파일만 지수 백오프로 재시도)
+
+    Args:
+        paths: 삭제할 MinIO 파일 경로 리스트
+    """
+    task_id = self.request.id
+    success, failed_files = delete_multiple_files(paths)
+
+    if success:
+        logger.info(f"Task {task_id}: MinIO 파일 {len(paths)}개 삭제 완료")
+        return {"deleted": len(paths), "failed": []}
+
+    if self.request.retries < self.max_retries:
+        countdown = 2 ** (self.request.retries + 1)
+        logger.warning(
+            f"Task {task_id}: 파일 삭제 재시도 ({self.request.retries + 1}/{self.max_retries}) - {failed_files}"
+        )
+        raise self.retry(args=[failed_files], countdown=countdown)
+
+    logger.error(f"Task {task_id}: 파일 삭제 최종 실패 - {failed_files}")
+    return {"deleted": len(paths) - len(failed_files), "failed": failed_files}
+
+
+@celery.task(name="verify_minio_object", bind=True)
+def verify_minio_object(self, file_id: str):
+    """
+    다운로드 중 MinIO에서 찾을 수 없었던 파일을 확인하고 상태를 기록하는 작업 (storage_audit 큐)
+
+    Args:
+        file_id: 확인할 DocumentFile ID
+    """
+    task_id = self.request.id
+    db = SessionLocal()
+    try:
+        document_file = db.get(DocumentFile, uuid.UUID(file_id))
+        if not document_file:
+            logger.warning(f"Task {task_id}: 파일 ID {file_id}를 찾을 수 없습니다.")
+            return {"file_id": file_id, "exists": None}
+
+        # 일시적인 오류일 수 있으므로 재시도를 포함한 존재 확인 후에만 실패로 기록
+        exists = check_file_exists(document_file.file_path)
+        if not exists:
+            metadata = dict(document_file.file_metadata or {})
+            metadata["minio_error"] = "File marked as completed but not found in storage"
+            metadata["error_time"] = datetime.utcnow().isoformat()
+            document_file.processing_status = "failed"
+            document_file.file_metadata = metadata
+            db.commit()
+            logger.warning(f"Task {task_id}: MinIO에 파일이 없어 실패로 표시 - {document_file.file_path}")
+
+        return {"file_id": file_id, "exists": exists}
+    finally:
+        db.close()
@@ -32,6 +32,23 @@ except (ImportError, AttributeError) as e:
     logger.warning(f"Milvus 연결 실패 (오류: {str(e)}): 벡터 데이터베이스 기능이 비활성화됩니다.")
 
 
+# Milvus 컬렉션 핸들 (작업마다 연결/조회하지 않도록 워커 프로세스당 한 번만 생성)
+_collection = None
+
+
+def get_collection():
+    """Milvus 컬렉션 핸들을 반환하는 함수 (컬렉션이 없으면 None)"""
+    global _collection
+    if _collection is None:
+        from pymilvus import Collection
+
+        connections.connect(alias="default", host=settings.MILVUS_HOST, port=settings.MILVUS_PORT)
+        if not utility.has_collection(settings.MILVUS_COLLECTION):
+            return None
+        _collection = Collection(settings.MILVUS_COLLECTION)
+    return _collection
+
+
 def get_db():
     """데이터베이스 세션 생성"""
     db = SessionLocal()
@@ -281,24 +298,19 @@ def delete_document_vectors(self, document_id):
 
         # 청크 삭제
         chunks = db.query(DocumentChunk).filter(DocumentChunk.document_id == document_id).all()
-        for chunk in chunks:
-            # 벡터 DB에서 벡터 삭제 (Milvus 사용 시)
-            if MILVUS_ENABLED and chunk.vector_id:
-                try:
-                    # Milvus 연결
-                    connections.connect(alias="default", host=settings.MILVUS_HOST, port=settings.MILVUS_PORT)
-
-                    # 벡터 삭제
-                    if utility.has_collection(settings.MILVUS_COLLECTION):
-                        from pymilvus import Collection
-
-                        collection = Collection(settings.MILVUS_COLLECTION)
-                        collection.delete(expr=f"id == {chunk.vector_id}")
-                except Exception as milvus_error:
-                    logger.error(f"Task {task_id}: Milvus 벡터 삭제 오류 - {str(milvus_error)}")
-
-            # DB에서 청크 삭제
-            db.delete(chunk)
+
+        # 벡터 DB에서 벡터를 한 번의 요청으로 삭제 (Milvus 사용 시)
+        vector_ids = [chunk.vector_id for chunk in chunks if chunk.vector_id]
+        if MILVUS_ENABLED and vector_ids:
+            try:
+                collection = get_collection()
+                if collection is not None:
+                    collection.delete(expr=f"id in {json.dumps(vector_ids)}")
+            except Exception as milvus_error:
+                logger.error(f"Task {task_id}: Milvus 벡터 삭제 오류 - {str(milvus_error)}")
+
+        # DB에서 청크 일괄 삭제
+        db.query(DocumentChunk).filter(DocumentChunk.document_id == document_id).delete(synchronize_session=False)
 
         # 벡터화 상태 업데이트
         document.vectorized = False
@@ -98,6 +98,19 @@ def create_chunks(text: str, chunk_size: int = 512, overlap: int = 50) -> List[s
     return chunks
 
 
+def _document_chunk_metadata(document: Document, total_chunks: int) -> Dict[str, Any]:
+    """문서 단위로 동일한 청크 메타데이터를 한 번만 계산"""
+    return {
+        "total_chunks": total_chunks,
+        "document_title": document.title,
+        "document_tags": document.tags,
+        "created_at": datetime.utcnow().isoformat(),
+        "document_created_at": document.created_at.isoformat() if document.created_at else None,
+        "document_start_date": document.start_date.isoformat() if document.start_date else None,
+        "document_end_date": document.end_date.isoformat() if document.end_date else None,
+    }
+
+
 def chunk_document(document: Document, file: DocumentFile, db: Session) -> List[DocumentChunk]:
     """문서를 청크로 분할하고 데이터베이스에 저장
 
@@ -118,27 +131,19 @@ def chunk_document(document: Document, file: DocumentFile, db: Session) -> List[
     if not text_chunks:
         return []
 
+    # 청크마다 바뀌지 않는 메타데이터는 루프 밖에서 한 번만 계산
+    base_metadata = _document_chunk_metadata(document, len(text_chunks))
+    base_metadata.update({"file_id": str(file.id), "file_name": file.original_filename, "file_type": file.file_type})
+
+    # 벡터 ID 일괄 생성 (실제 임베딩은 나중에 구현)
+    vector_ids = [str(uuid.uuid4()) for _ in text_chunks]
+
     # 청크를 데이터베이스에 저장
     db_chunks = []
 
-    for i, chunk_text in enumerate(text_chunks):
+    for i, (chunk_text, vector_id) in enumerate(zip(text_chunks, vector_ids)):
         # 청크 메타데이터 생성
-        chunk_metadata = {
-            "file_id": str(file.id),
-            "file_name": file.original_filename,
-            "file_type": file.file_type,
-            "chunk_index": i,
-            "total_chunks": len(text_chunks),
-            "document_title": document.title,
-            "document_tags": document.tags,
-            "created_at": datetime.utcnow().isoformat(),
-            "document_created_at": document.created_at.isoformat() if document.created_at else None,
-            "document_start_date": document.start_date.isoformat() if document.start_date else None,
-            "document_end_date": document.end_date.isoformat() if document.end_date else None,
-        }
-
-        # 벡터 ID 생성 (실제 임베딩은 나중에 구현)
-        vector_id = str(uuid.uuid4())
+        chunk_metadata = {**base_metadata, "chunk_index": i}
 
         # 청크 객체 생성
         db_chunk = DocumentChunk(
@@ -179,25 +184,19 @@ def simple_chunk_document(document: Document, db: Session) -> List[DocumentChunk
     if not text_chunks:
         return []
 
+    # 청크마다 바뀌지 않는 메타데이터는 루프 밖에서 한 번만 계산
+    base_metadata = _document_chunk_metadata(document, len(text_chunks))
+    base_metadata["is_summary"] = True
+
+    # 벡터 ID 일괄 생성 (실제 임베딩은 나중에 구현)
+    vector_ids = [str(uuid.uuid4()) for _ in text_chunks]
+
     # 청크를 데이터베이스에 저장
     db_chunks = []
 
-    for i, chunk_text in enumerate(text_chunks):
+    for i, (chunk_text, vector_id) in enumerate(zip(text_chunks, vector_ids)):
         # 청크 메타데이터 생성
-        chunk_metadata = {
-            "chunk_index": i,
-            "total_chunks": len(text_chunks),
-            "document_title": document.title,
-            "document_tags": document.tags,
-            "created_at": datetime.utcnow().isoformat(),
-            "document_created_at": document.created_at.isoformat() if document.created_at else None,
-            "document_start_date": document.start_date.isoformat() if document.start_date else None,
-            "document_end_date": document.end_date.isoformat() if document.end_date else None,
-            "is_summary": True,
-        }
-
-        # 벡터 ID 생성 (실제 임베딩은 나중에 구현)
-        vector_id = str(uuid.uuid4())
+        chunk_metadata = {**base_metadata, "chunk_index": i}
 
         # 청크 객체 생성
         db_chunk = DocumentChunk(
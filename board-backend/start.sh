@@ -15,7 +15,7 @@ case "$APP_MODE" in
     ;;
   worker)
     echo "Starting Celery worker..."
-    exec celery -A app.celery_worker.celery worker --loglevel=info
+    exec celery -A app.celery_worker.celery worker --loglevel=info -Q celery,storage_audit
     ;;
   flower)
     echo "Starting Celery Flower monitoring..."
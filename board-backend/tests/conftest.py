@@ -0,0 +1,50 @@
+import os
+import uuid
+
+import pytest
+
+# 테스트 중 시작 이벤트가 기존 테이블을 삭제하지 않도록 설정 (app.main 임포트 전에 지정)
+os.environ.setdefault("RECREATE_TABLES", "false")
+
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app.auth import get_current_admin_user
+from app.database import count_queries, engine
+from app.main import app
+from app.models import User
+
+
+@pytest.fixture(scope="session")
+def database():
+    """테스트용 PostgreSQL(DATABASE_URL)에 연결할 수 없으면 DB가 필요한 테스트를 건너뜀"""
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as e:
+        pytest.skip(f"데이터베이스에 연결할 수 없습니다: {e}")
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    """시작 이벤트(테이블 준비)를 실행한 상태의 테스트 클라이언트 (비동기 엔진이 같은 이벤트 루프를 쓰도록 세션 단위로 유지)"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def admin_client(client):
+    """관리자 권한 확인을 통과하는 테스트 클라이언트"""
+    admin = User(id=uuid.uuid4(), role="admin", is_active=True, is_approved=True)
+    app.dependency_overrides[get_current_admin_user] = lambda: admin
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+
+@pytest.fixture
+def query_counter():
+    """실행된 SQL 문 목록을 기록하는 컨텍스트 매니저 (with query_counter() as q: ...; len(q))"""
+    return count_queries
@@ -0,0 +1,59 @@
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from app.database import SessionLocal
+from app.models import Document, DocumentFile, User, document_child_deletes
+
+DOCUMENT_COUNT = 5
+FILES_PER_DOCUMENT = 2
+
+
+@pytest.fixture
+def documents_with_files(database):
+    """파일이 여러 개 달린 문서들을 만들고 테스트 후 삭제"""
+    db = SessionLocal()
+    owner = User(email=f"query-counter-{uuid.uuid4()}@example.com", hashed_password="-", is_approved=True)
+    db.add(owner)
+    db.flush()
+
+    document_ids = []
+    for doc_index in range(DOCUMENT_COUNT):
+        document = Document(title=f"query counter {doc_index}", user_id=owner.id, tags=["query-counter"])
+        db.add(document)
+        db.flush()
+        document_ids.append(document.id)
+        for file_index in range(FILES_PER_DOCUMENT):
+            db.add(
+                DocumentFile(
+                    document_id=document.id,
+                    file_path=f"{uuid.uuid4()}.pdf",
+                    original_filename=f"file-{file_index}.pdf",
+                    file_type="pdf",
+                )
+            )
+    db.commit()
+
+    try:
+        yield document_ids
+    finally:
+        for document_id in document_ids:
+            for statement in document_child_deletes(document_id):
+                db.execute(statement)
+        db.execute(delete(Document).where(Document.id.in_(document_ids)))
+        db.execute(delete(User).where(User.id == owner.id))
+        db.commit()
+        db.close()
+
+
+# 관리자 문서 목록은 문서 수와 무관하게 문서 조회 + 파일 조회로 끝나야 함 (N+1 회귀 방지)
+def test_admin_documents_query_count_is_bounded(admin_client, query_counter, documents_with_files):
+    with query_counter() as q:
+        response = admin_client.get("/api/admin/documents", params={"tag": "query-counter"})
+
+    assert response.status_code == 200
+    items = response.json()
+    assert len(items) == DOCUMENT_COUNT
+    assert all(len(item["file_names"]) == FILES_PER_DOCUMENT for item in items)
+    assert len(q) <= 3